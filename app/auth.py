@@ -1,13 +1,27 @@
+import hmac
 import jwt
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from fastapi import Depends, HTTPException
+from typing import Any, Dict, Optional
+from fastapi import Depends, Header, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .config import settings
 
 security = HTTPBearer()
 
 
-def create_token(user_id: str) -> str:
+@dataclass(frozen=True)
+class TokenClaims:
+    """
+    Doğrulanmış token içeriği.
+    Profil claim'leri (opsiyonel "prf" alanı) sadece JWT_PROFILE_CLAIMS ile üretilir:
+    - profile_version: profil sürümü (değişince token geçersiz olur)
+    """
+    user_id: str
+    profile_version: Optional[int] = None
+
+
+def create_token(user_id: str, profile: Optional[Dict[str, Any]] = None) -> str:
     now = datetime.now(timezone.utc)
     payload = {
         "sub": user_id,
@@ -16,10 +30,12 @@ def create_token(user_id: str) -> str:
         "iat": int(now.timestamp()),
         "exp": int((now + timedelta(days=settings.JWT_EXPIRE_DAYS)).timestamp()),
     }
+    if profile:
+        payload["prf"] = profile
     return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
 
 
-def parse_token(token: str) -> str:
+def parse_claims(token: str) -> TokenClaims:
     try:
         payload = jwt.decode(
             token,
@@ -28,13 +44,37 @@ def parse_token(token: str) -> str:
             audience=settings.JWT_AUD,
             issuer=settings.JWT_ISS,
         )
-        return payload["sub"]
+        prf = payload.get("prf") or {}
+        return TokenClaims(
+            user_id=payload["sub"],
+            profile_version=prf.get("pv"),
+        )
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
 
+def parse_token(token: str) -> str:
+    return parse_claims(token).user_id
+
+
 def get_current_user_id(
     creds: HTTPAuthorizationCredentials = Depends(security),
 ) -> str:
     return parse_token(creds.credentials)
 
+
+def get_token_claims(
+    creds: HTTPAuthorizationCredentials = Depends(security),
+) -> TokenClaims:
+    return parse_claims(creds.credentials)
+
+
+def require_admin(x_admin_token: str = Header(default="")) -> None:
+    """
+    Admin uç noktaları için basit paylaşılan anahtar kontrolü.
+    ADMIN_TOKEN ayarlanmamışsa admin uç noktaları tamamen kapalıdır.
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
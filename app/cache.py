@@ -0,0 +1,346 @@
+import json
+import logging
+import queue
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse, unquote
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------
+# PAYLAŞILAN CACHE KATMANI
+# ----------------------------------------------------
+#
+# Günlük kelimeler, transit ve token (profil sürümü) yolları bu arayüzü kullanır.
+# - memory://            process içi, sınırlı LRU (varsayılan)
+# - redis://host:port/db Redis protokolü (RESP) konuşan herhangi bir sunucu
+# Cache her zaman opsiyoneldir: hata veya ıska durumunda çağıran DB'ye düşer.
+#
+# DB'de değişebilen değerler (günlük kelimeler, profil sürümleri) sadece paylaşılan
+# arka uçta tutulur (get_shared_cache): process içi cache'teki kayıt başka bir
+# worker'daki katalog senkronu / profil değişikliğiyle silinemez. Sadece girdisine
+# bağlı saf değerler (örn. günün transitleri) her arka uçta cache'lenebilir.
+
+
+class CacheBackend:
+    """
+    Anahtar → string değer. Alt sınıflar *_raw metodlarını uygular.
+    shared: tüm worker/node'lar aynı veriyi görür (silme/güncelleme herkese yansır).
+    """
+
+    shared = True
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+
+    def _k(self, key: str) -> str:
+        return self.prefix + key
+
+    # Alt sınıfların uygulayacağı ham işlemler
+    def get_many_raw(self, keys: Sequence[str]) -> List[Optional[str]]:
+        raise NotImplementedError
+
+    def set_many_raw(self, items: Dict[str, str], ttl: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def delete_raw(self, keys: Sequence[str]) -> None:
+        raise NotImplementedError
+
+    # JSON yardımcıları
+    def get_many(self, keys: Sequence[str]) -> List[Any]:
+        """Anahtar sırasıyla değerler; ıska için None."""
+        if not keys:
+            return []
+        raw = self.get_many_raw([self._k(k) for k in keys])
+        return [json.loads(v) if v is not None else None for v in raw]
+
+    def get(self, key: str) -> Any:
+        return self.get_many([key])[0]
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        if items:
+            self.set_many_raw(
+                {self._k(k): json.dumps(v, ensure_ascii=False) for k, v in items.items()},
+                ttl,
+            )
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self.set_many({key: value}, ttl)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = [self._k(k) for k in keys]
+        if keys:
+            self.delete_raw(keys)
+
+
+class MemoryCache(CacheBackend):
+    """Process içi, TTL destekli, boyutu sınırlı LRU."""
+
+    shared = False
+
+    def __init__(self, max_entries: int = 100_000, prefix: str = ""):
+        super().__init__(prefix)
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many_raw(self, keys: Sequence[str]) -> List[Optional[str]]:
+        now = time.monotonic()
+        out: List[Optional[str]] = []
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    out.append(None)
+                elif entry[0] is not None and entry[0] <= now:
+                    del self._data[key]
+                    out.append(None)
+                else:
+                    self._data.move_to_end(key)
+                    out.append(entry[1])
+        return out
+
+    def set_many_raw(self, items: Dict[str, str], ttl: Optional[int]) -> None:
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (expires, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_raw(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+
+# ----------------------------------------------------
+# REDIS PROTOKOLÜ (RESP2) İSTEMCİSİ
+# ----------------------------------------------------
+
+
+class RespError(Exception):
+    """Sunucunun döndürdüğü '-ERR ...' yanıtı."""
+
+
+def encode_command(*args: Any) -> bytes:
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(out)
+
+
+def read_reply(f) -> Any:
+    """Tek bir RESP yanıtı okur (f: soketin 'rb' makefile'ı)."""
+    line = f.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("connection closed by cache server")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode("utf-8")
+    if kind == b"-":
+        return RespError(body.decode("utf-8"))
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        n = int(body)
+        if n < 0:
+            return None
+        data = f.read(n + 2)
+        if len(data) != n + 2:
+            raise ConnectionError("connection closed by cache server")
+        return data[:-2].decode("utf-8")
+    if kind == b"*":
+        n = int(body)
+        if n < 0:
+            return None
+        return [read_reply(f) for _ in range(n)]
+    raise ConnectionError(f"unexpected RESP reply: {line!r}")
+
+
+class _Connection:
+    def __init__(self, host: str, port: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile("rb")
+
+    def pipeline(self, commands: Sequence[Tuple[Any, ...]]) -> List[Any]:
+        """Tüm komutlar tek yazımda gönderilir, yanıtlar sırayla okunur."""
+        self.sock.sendall(b"".join(encode_command(*c) for c in commands))
+        return [read_reply(self.file) for _ in commands]
+
+    def close(self) -> None:
+        try:
+            self.file.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisCache(CacheBackend):
+    """
+    Redis protokolü konuşan sunucuya bağlantı havuzlu istemci.
+    - get_many: tek MGET
+    - set_many: SET ... EX komutları tek pipeline'da
+    - Bağlantı/protokol hatalarında uyarı loglanır ve ıska gibi davranılır
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 16,
+        timeout: float = 0.25,
+        prefix: str = "",
+    ):
+        super().__init__(prefix)
+        u = urlparse(url)
+        self.host = u.hostname or "127.0.0.1"
+        self.port = u.port or 6379
+        self.password = unquote(u.password) if u.password else None
+        self.db = int(u.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._idle: "queue.LifoQueue[_Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    # --- bağlantı havuzu ---
+
+    def _connect(self) -> _Connection:
+        conn = _Connection(self.host, self.port, self.timeout)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            for reply in conn.pipeline(setup):
+                if isinstance(reply, RespError):
+                    conn.close()
+                    raise reply
+        return conn
+
+    def _acquire(self) -> Tuple[_Connection, bool]:
+        """(bağlantı, havuzdan mı alındı)"""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self.pool_size
+            if can_create:
+                self._created += 1
+        if not can_create:
+            return self._idle.get(timeout=self.timeout), True
+        return self._open(), False
+
+    def _open(self) -> _Connection:
+        """Sayaçta yeri ayrılmış yeni bağlantı; açılamazsa yer bırakılır."""
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _discard(self, conn: _Connection) -> None:
+        conn.close()
+        with self._lock:
+            self._created -= 1
+
+    def execute(self, commands: Sequence[Tuple[Any, ...]]) -> List[Any]:
+        """
+        Komutları pipeline ile çalıştırır; bozulan bağlantı havuza dönmez.
+        Havuzdan alınan bağlantı kopmuşsa (sunucu yeniden başladı, boşta zaman aşımı)
+        komutlar bir kez yeni bağlantıyla tekrarlanır; yoksa geçersiz kılma yazımları
+        (DEL, pv) kaybolur. Zaman aşımı tekrarlanmaz (gecikme ikiye katlanmasın).
+        """
+        conn, pooled = self._acquire()
+        while True:
+            try:
+                replies = conn.pipeline(commands)
+                break
+            except OSError as exc:
+                if not pooled or isinstance(exc, TimeoutError):
+                    self._discard(conn)
+                    raise
+                conn.close()
+                conn, pooled = self._open(), False
+            except Exception:
+                self._discard(conn)
+                raise
+        self._idle.put(conn)
+        return replies
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    # --- CacheBackend ---
+
+    def get_many_raw(self, keys: Sequence[str]) -> List[Optional[str]]:
+        try:
+            reply = self.execute([("MGET", *keys)])[0]
+            if isinstance(reply, RespError):
+                raise reply
+            return reply
+        except Exception as exc:
+            logger.warning("cache MGET failed, falling back: %s", exc)
+            return [None] * len(keys)
+
+    def set_many_raw(self, items: Dict[str, str], ttl: Optional[int]) -> None:
+        commands = [
+            ("SET", k, v, "EX", ttl) if ttl else ("SET", k, v)
+            for k, v in items.items()
+        ]
+        try:
+            self.execute(commands)
+        except Exception as exc:
+            logger.warning("cache SET failed: %s", exc)
+
+    def delete_raw(self, keys: Sequence[str]) -> None:
+        try:
+            self.execute([("DEL", *keys)])
+        except Exception as exc:
+            logger.warning("cache DEL failed: %s", exc)
+
+
+def create_cache(url: str) -> CacheBackend:
+    scheme = urlparse(url).scheme or "memory"
+    if scheme == "memory":
+        return MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_PREFIX)
+    if scheme == "redis":
+        return RedisCache(
+            url,
+            pool_size=settings.CACHE_POOL_SIZE,
+            timeout=settings.CACHE_TIMEOUT,
+            prefix=settings.CACHE_PREFIX,
+        )
+    raise ValueError(f"Unsupported CACHE_URL scheme: {scheme}")
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def get_cache() -> CacheBackend:
+    global _cache
+    if _cache is None:
+        _cache = create_cache(settings.CACHE_URL)
+    return _cache
+
+
+def get_shared_cache() -> Optional[CacheBackend]:
+    """Worker'lar arası paylaşılan cache; process içi arka uçta None (DB kaynak kalır)."""
+    cache = get_cache()
+    return cache if cache.shared else None
@@ -7,6 +7,20 @@ class Settings(BaseSettings):
     JWT_EXPIRE_DAYS: int = 30
     DATABASE_URL: str = "sqlite:///./skullmod.db"
     DEFAULT_TZ: str = "Europe/Istanbul"
+    ADMIN_TOKEN: str = ""  # boşsa admin uç noktaları kapalı
+    EXPORT_YIELD_PER: int = 1000
+    DAILY_WORD_STRATEGY: str = "personal_energy"  # personal_energy / classic / lean
+    JWT_PROFILE_CLAIMS: bool = False  # token'a imzalı profil özeti ekle (DB'siz cache yolu)
+    REGISTER_ASYNC_POOL: bool = False  # havuzu kayıttan sonra process havuzunda hesapla (ölçümde kazanç yok, isteğe bağlı)
+    POOL_WORKERS: int = 2
+    POOL_QUEUE_LIMIT: int = 256  # dolunca kayıt satır içi hesaplamaya düşer
+    POOL_WAIT_SECONDS: float = 2.0
+    CACHE_URL: str = "memory://"  # veya redis://[:parola@]host:port/db (günlük kelime/token cache'i için gerekli)
+    CACHE_PREFIX: str = "skullmod:"
+    CACHE_MAX_ENTRIES: int = 100_000  # memory:// için
+    CACHE_POOL_SIZE: int = 16  # redis:// bağlantı havuzu
+    CACHE_TIMEOUT: float = 0.25  # sn; aşılırsa cache ıska sayılır
+    DAILY_CACHE_TTL: int = 2 * 24 * 3600
 
     class Config:
         env_file = ".env"
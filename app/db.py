@@ -1,3 +1,4 @@
+from sqlalchemy import inspect, text
 from sqlmodel import SQLModel, create_engine, Session
 from .config import settings
 
@@ -7,8 +8,59 @@ engine = create_engine(
 )
 
 def init_db():
-    from .models import User, DailyWord  # tablo tanımları
-    SQLModel.metadata.create_all(engine)
+    from .models import Pool, User, DailyWord, CatalogSnapshot  # tablo tanımları
+    with engine.connect() as conn:
+        lock_schema(conn)
+        SQLModel.metadata.create_all(conn)
+        add_missing_columns(conn)
+        create_missing_indexes(conn)
+        conn.commit()
+
+
+def lock_schema(conn):
+    """
+    Birden çok uvicorn worker'ı aynı anda açılınca şema kontrolleri ve değişiklikleri
+    sırayla yapılır; aksi halde biri "table ... already exists" / "database is locked"
+    ile açılamaz. Kilit, conn'un transaction'ı bitince bırakılır.
+    """
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif conn.dialect.name == "postgresql":
+        conn.exec_driver_sql("SELECT pg_advisory_xact_lock(hashtext('skullmod:init_db'))")
+
+
+def add_missing_columns(conn):
+    """
+    create_all mevcut tablolara yeni kolon eklemez.
+    Modellere sonradan eklenen nullable kolonları (ve indekslerini) ALTER TABLE ile ekler.
+    """
+    insp = inspect(conn)
+    quote = conn.dialect.identifier_preparer.quote
+    for table in SQLModel.metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        existing = {c["name"] for c in insp.get_columns(table.name)}
+        for col in table.columns:
+            if col.name in existing or not col.nullable:
+                continue
+            col_type = col.type.compile(dialect=conn.dialect)
+            conn.execute(text(
+                f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(col.name)} {col_type}"
+            ))
+            for idx in table.indexes:
+                if col.name in idx.columns:
+                    idx.create(conn, checkfirst=True)
+
+
+def create_missing_indexes(conn):
+    """
+    create_all mevcut tablolara sonradan tanımlanan indeksleri de eklemez
+    (örn. DailyWord.user_id); mevcut olmayanlar burada oluşturulur.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for idx in table.indexes:
+            idx.create(conn, checkfirst=True)
+
 
 def get_session():
     with Session(engine) as session:
@@ -1,20 +1,32 @@
 from datetime import date
-import json
+from typing import Optional
+import logging
 import uuid
-import random
 
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
 
 from .config import settings
-from .db import init_db
+from .db import engine, init_db
 from .models import User
 from .schemas import RegisterRequest, RegisterResponse, DailyWordsResponse
-from .auth import create_token, get_current_user_id
+from .auth import (
+    TokenClaims,
+    create_token,
+    get_current_user_id,
+    get_token_claims,
+    require_admin,
+)
 from .deps import get_db
-from .services.words_engine import build_cornerstone_pool, get_or_create_daily_words
+from .services.daily import get_or_create_daily_words
+from .services.export import iter_daily_word_lines, gzip_stream
+from .services.catalog_sync import ensure_snapshot, sync_catalogs
+from .services import profile, pool_jobs, pools
+from .services.cohort import precompute_day
 
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="SkullMod Daily Words API",
@@ -33,8 +45,21 @@ app.add_middleware(
 
 @app.on_event("startup")
 def on_startup():
-    """Uygulama ayağa kalkarken DB tablolarını oluştur."""
+    """
+    Uygulama ayağa kalkarken DB tablolarını oluştur, katalog senkronu için
+    taban sürüm yoksa kaydet. (Eski havuz göçü her worker'da çalışmasın diye
+    /api/v1/admin/pools/migrate ile ayrıca tetiklenir.)
+    """
     init_db()
+    with Session(engine) as session:
+        ensure_snapshot(session)
+    if settings.REGISTER_ASYNC_POOL:
+        pool_jobs.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    pool_jobs.shutdown()
 
 
 @app.get("/")
@@ -43,179 +68,14 @@ def root():
 
 
 # ----------------------------------------------------
-# ASTRO TABANLI KİŞİSEL "GÜNLÜK ENERJİ" ALGORİTMASI
+# KAYIT / REGISTER ENDPOINT
 # ----------------------------------------------------
 
-ENERGY_WORDS_BY_ELEMENT = {
-    "fire": [
-        "Atılım",
-        "Cesaret",
-        "Tutku",
-        "Kıvılcım",
-        "Aksiyon",
-        "Yeniden Doğuş",
-        "Gözükaralık",
-        "Motivasyon",
-    ],
-    "earth": [
-        "Toplanma",
-        "Köklenme",
-        "Sabır",
-        "İstikrar",
-        "Dayanıklılık",
-        "Planlama",
-        "Somutlaşma",
-        "Denge",
-    ],
-    "air": [
-        "İlham",
-        "Merak",
-        "Fikir",
-        "İletişim",
-        "Bağlantı",
-        "Öğrenme",
-        "Bakış Açısı",
-        "Netlik",
-    ],
-    "water": [
-        "Şifa",
-        "Akış",
-        "Duyarlılık",
-        "Arınma",
-        "Empati",
-        "Kabulleniş",
-        "Derinleşme",
-        "Sakinleşme",
-    ],
-}
-
-ELEMENT_LABEL_TR = {
-    "fire": "ateş",
-    "earth": "toprak",
-    "air": "hava",
-    "water": "su",
-}
-
-
-def get_zodiac_element_from_birth(birth_dt) -> str:
-    """
-    Kullanıcının doğum tarihinden zodyak elementini çıkarır.
-    Element: fire / earth / air / water
-    """
-    if birth_dt is None:
-        return "earth"  # nötr
-
-    if hasattr(birth_dt, "date"):
-        birth_dt = birth_dt.date()
-
-    m = birth_dt.month
-    d = birth_dt.day
-
-    # Koç: 21 Mart – 19 Nisan (ateş)
-    if (m == 3 and d >= 21) or (m == 4 and d <= 19):
-        return "fire"
-    # Boğa: 20 Nisan – 20 Mayıs (toprak)
-    if (m == 4 and d >= 20) or (m == 5 and d <= 20):
-        return "earth"
-    # İkizler: 21 Mayıs – 20 Haziran (hava)
-    if (m == 5 and d >= 21) or (m == 6 and d <= 20):
-        return "air"
-    # Yengeç: 21 Haziran – 22 Temmuz (su)
-    if (m == 6 and d >= 21) or (m == 7 and d <= 22):
-        return "water"
-    # Aslan: 23 Temmuz – 22 Ağustos (ateş)
-    if (m == 7 and d >= 23) or (m == 8 and d <= 22):
-        return "fire"
-    # Başak: 23 Ağustos – 22 Eylül (toprak)
-    if (m == 8 and d >= 23) or (m == 9 and d <= 22):
-        return "earth"
-    # Terazi: 23 Eylül – 22 Ekim (hava)
-    if (m == 9 and d >= 23) or (m == 10 and d <= 22):
-        return "air"
-    # Akrep: 23 Ekim – 21 Kasım (su)
-    if (m == 10 and d >= 23) or (m == 11 and d <= 21):
-        return "water"
-    # Yay: 22 Kasım – 21 Aralık (ateş)
-    if (m == 11 and d >= 22) or (m == 12 and d <= 21):
-        return "fire"
-    # Oğlak: 22 Aralık – 19 Ocak (toprak)
-    if (m == 12 and d >= 22) or (m == 1 and d <= 19):
-        return "earth"
-    # Kova: 20 Ocak – 18 Şubat (hava)
-    if (m == 1 and d >= 20) or (m == 2 and d <= 18):
-        return "air"
-    # Balık: 19 Şubat – 20 Mart (su)
-    if (m == 2 and d >= 19) or (m == 3 and d <= 20):
-        return "water"
-
-    return "earth"
-
-
-def pick_personal_daily_energy_word(user: User, today: date) -> tuple[str, str]:
-    """
-    Kullanıcı + tarih + astro element'e göre deterministik bir günlük enerji kelimesi seçer.
-    DÖNÜŞ: (energy_word, element_key)
-
-    ÖNEMLİ: Seed artık user_id'ye değil, KİŞİSEL BİLGİLERE bağlı:
-    - first_name, last_name
-    - birth_date
-    - birth_place
-    - gün
-    Böylece aynı verilerle tekrar kayıt olunsa bile, aynı gün aynı kelime gelir.
-    """
-    birth_dt = getattr(user, "birth_date", None)
-    element = get_zodiac_element_from_birth(birth_dt)
-    words = ENERGY_WORDS_BY_ELEMENT.get(element, ENERGY_WORDS_BY_ELEMENT["earth"])
-
-    # Kişisel verileri toplayalım
-    first = (getattr(user, "first_name", "") or "").strip().upper()
-    last = (getattr(user, "last_name", "") or "").strip().upper()
-    birth_place = (getattr(user, "birth_place", "") or "").strip().upper()
-
-    if hasattr(birth_dt, "date"):
-        birth_str = birth_dt.date().isoformat()
-    elif birth_dt:
-        birth_str = birth_dt.isoformat()
-    else:
-        birth_str = "NO_BIRTH"
-
-    # Deterministik seed: Kişisel veriler + gün + element
-    seed_str = f"{first}-{last}-{birth_str}-{birth_place}-{today.isoformat()}-{element}"
-
-    rnd = random.Random(seed_str)
-    index = rnd.randint(0, len(words) - 1)
 
-    return words[index], element
-
-
-def build_motto(word1: str, energy_word: str, element_key: str) -> str:
-    """
-    Köşe taşı + günlük enerji + element bilgisine göre motto üretir.
-    """
-    element_label = ELEMENT_LABEL_TR.get(element_key, "toprak")
-
-    templates = [
-        "Bugün {energy} senin {element} enerjini uyandırırken, {corner} pusulan olmaya devam ediyor.",
-        "{energy} enerjisi bugün alanında; {corner} ise attığın her adımın merkezinde.",
-        "Gökyüzü bugün {element} tınısında: {energy} seni çağırıyor, {corner} rotanı sabitliyor.",
-        "Bugünün akışı {energy}; sen {corner} ile kendi hikâyeni yeniden yazıyorsun.",
-    ]
-
-    seed_str = f"{word1}-{energy_word}-{element_key}"
-    rnd = random.Random(seed_str)
-    idx = rnd.randint(0, len(templates) - 1)
-
-    template = templates[idx]
-    return template.format(
-        energy=energy_word,
-        corner=word1,
-        element=element_label,
-    )
-
-
-# ----------------------------------------------------
-# KAYIT / REGISTER ENDPOINT
-# ----------------------------------------------------
+def _issue_token(user: User) -> str:
+    """JWT_PROFILE_CLAIMS açıksa token'a imzalı profil özeti eklenir."""
+    claims = profile.profile_claims(user) if settings.JWT_PROFILE_CLAIMS else None
+    return create_token(user.user_id, claims)
 
 
 @app.post("/api/v1/register", response_model=RegisterResponse)
@@ -225,32 +85,39 @@ def register(
 ):
     """
     Kullanıcı kaydı:
-    - Kişisel cornerstone_pool oluşturulur
+    - Paylaşılan köşe taşı havuzu bağlanır (REGISTER_ASYNC_POOL ile arka planda)
     - DB'ye kaydedilir
     - JWT token döner
     """
     user_id = str(uuid.uuid4())
 
-    pool = build_cornerstone_pool(
-        payload.first_name,
-        payload.last_name,
-        payload.birth_date,
-        payload.birth_place,
-    )
-    pool_json = json.dumps(pool, ensure_ascii=False)
-
     user = User(
         user_id=user_id,
         first_name=payload.first_name,
         last_name=payload.last_name,
         birth_date=payload.birth_date,
         birth_place=payload.birth_place,
-        cornerstone_pool=pool_json,
     )
+
+    # Asenkron mod: satır hemen yazılır, havuz arka planda bağlanır.
+    # Kapalıysa veya kuyruk doluysa havuz satır içi çözülür (çoğunlukla process memo'sundan).
+    deferred = settings.REGISTER_ASYNC_POOL
+    if not deferred:
+        pools.assign_pool(db, user)
+
     db.add(user)
     db.commit()
 
-    token = create_token(user_id)
+    if deferred and not pool_jobs.submit(
+        user_id,
+        payload.first_name,
+        payload.last_name,
+        payload.birth_date,
+        payload.birth_place,
+    ):
+        pool_jobs.ensure_pool(db, user)
+
+    token = _issue_token(user)
 
     return RegisterResponse(
         success=True,
@@ -259,6 +126,31 @@ def register(
     )
 
 
+# ----------------------------------------------------
+# TOKEN YENİLEME
+# ----------------------------------------------------
+
+
+@app.post("/api/v1/token/refresh", response_model=RegisterResponse)
+def refresh_token(
+    current_user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Geçerli imzalı bir token ile güncel profil sürümlü yeni token üretir
+    (profil sürümü değiştiği için reddedilen token'lar buradan yenilenir).
+    """
+    user = db.exec(select(User).where(User.user_id == current_user_id)).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return RegisterResponse(
+        success=True,
+        token=_issue_token(user),
+        user_id=user.user_id,
+    )
+
+
 # ----------------------------------------------------
 # GÜNLÜK KELİMELER ENDPOINT
 # ----------------------------------------------------
@@ -266,40 +158,147 @@ def register(
 
 @app.get("/api/v1/daily-words", response_model=DailyWordsResponse)
 def daily_words(
-    current_user_id: str = Depends(get_current_user_id),
+    claims: TokenClaims = Depends(get_token_claims),
     db: Session = Depends(get_db),
 ):
     """
     Günlük 2 kelime + motto:
     - Köşe taşı kelimesi (kişisel cornerstone_pool'dan)
-    - Günlük enerji kelimesi (kişisel + astro element'e göre)
+    - Günlük enerji kelimesi (varsayılan strateji: kişisel + astro element'e göre)
     - Aynı gün + aynı kişisel veriler için deterministik
+    - Profil claim'li token + paylaşılan cache'te bugünün sonucu varsa DB'ye hiç gidilmez
     """
-    user = db.exec(select(User).where(User.user_id == current_user_id)).first()
+    today = date.today()
+    has_profile = claims.profile_version is not None
+
+    if has_profile:
+        stale, cached = profile.lookup_daily(claims, today)
+        if stale:
+            raise HTTPException(status_code=401, detail="Token profile is outdated")
+        if cached is not None:
+            return DailyWordsResponse(success=True, data=cached)
+
+    user = db.exec(select(User).where(User.user_id == claims.user_id)).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not user.cornerstone_pool:
+    if has_profile:
+        version = profile.current_profile_version(user)
+        profile.note_profile_version(user.user_id, version)
+        if claims.profile_version != version:
+            raise HTTPException(status_code=401, detail="Token profile is outdated")
+
+    if not pools.has_pool(user):
+        # Arka plan havuz işi henüz bitmemiş olabilir: kısa bekle / burada hesapla
+        try:
+            pool_jobs.ensure_pool(db, user)
+        except Exception:
+            logger.exception("cornerstone pool resolution failed for user %s", user.user_id)
+            db.rollback()
+    if not pools.has_pool(user):
         return DailyWordsResponse(
             success=False,
             error="Kullanıcının köşe taşı havuzu bulunamadı. Lütfen profilinizi kontrol edin."
         )
 
-    today = date.today()
-
-    # words_engine içindeki mantığı kişisel köşe taşı için kullanmaya devam ediyoruz
-    cornerstone_word, _, _ = get_or_create_daily_words(db, user, today)
-
-    # KİŞİYE ÖZEL GÜNLÜK ENERJİ + MOTTOSU
-    energy_word, element_key = pick_personal_daily_energy_word(user, today)
-    motto = build_motto(cornerstone_word, energy_word, element_key)
+    # Seçili kelime stratejisi (DAILY_WORD_STRATEGY) sadece ihtiyaç duyduğu
+    # girdileri hesaplar; DB'ye yazılan kayıt ile dönen yanıt birebir aynıdır.
+    word1, word2, motto = get_or_create_daily_words(db, user, today)
 
     return DailyWordsResponse(
         success=True,
         data={
-            "word1": cornerstone_word,
-            "word2": energy_word,
+            "word1": word1,
+            "word2": word2,
             "motto": motto,
             "date": today.isoformat()
         }
     )
+
+
+# ----------------------------------------------------
+# GEÇMİŞ DIŞA AKTARMA (NDJSON STREAM)
+# ----------------------------------------------------
+
+
+def _export_response(user_id, gzip: bool, filename: str) -> StreamingResponse:
+    chunks = iter_daily_word_lines(user_id)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        chunks = gzip_stream(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        chunks,
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+
+@app.get("/api/v1/daily-words/export")
+def export_daily_words(
+    gzip: bool = False,
+    current_user_id: str = Depends(get_current_user_id),
+):
+    """
+    Kullanıcının tüm DailyWord geçmişi (NDJSON, satır başına 1 kayıt).
+    - ?gzip=true ile sıkıştırılmış akış
+    - Sabit bellek: kayıtlar sunucu tarafı cursor ile akıtılır
+    """
+    return _export_response(current_user_id, gzip, "daily-words.ndjson")
+
+
+@app.get("/api/v1/admin/daily-words/export", dependencies=[Depends(require_admin)])
+def export_all_daily_words(gzip: bool = False):
+    """Tüm kullanıcıların DailyWord geçmişi (admin, X-Admin-Token başlığı gerekir)."""
+    return _export_response(None, gzip, "daily-words-all.ndjson")
+
+
+# ----------------------------------------------------
+# KATALOG SENKRONİZASYONU (ARTIMSAL GEÇERSİZ KILMA)
+# ----------------------------------------------------
+
+
+@app.post("/api/v1/admin/catalogs/sync", dependencies=[Depends(require_admin)])
+def sync_keyword_catalogs(
+    dry_run: bool = True,
+    db: Session = Depends(get_db),
+):
+    """
+    app/data kataloglarındaki değişiklikleri son senkronize sürümle karşılaştırır.
+    - Sadece etkilenen havuzlar ve bugün/sonrası DailyWord satırları yeniden hesaplanır
+    - Varsayılan dry_run=true: kaç kullanıcı/satırın değişeceğini raporlar, yazmaz
+    """
+    return sync_catalogs(db, dry_run=dry_run)
+
+
+# ----------------------------------------------------
+# HAVUZ GÖÇÜ (TEK SEFERLİK)
+# ----------------------------------------------------
+
+
+@app.post("/api/v1/admin/pools/migrate", dependencies=[Depends(require_admin)])
+def migrate_pools(db: Session = Depends(get_db)):
+    """
+    Kullanıcı başına JSON havuzları paylaşılan Pool kayıtlarına taşır.
+    Tekrar çalıştırmak güvenlidir; rapor: taşınan kullanıcı ve havuz sayısı.
+    """
+    return pools.migrate_user_pools(db)
+
+
+# ----------------------------------------------------
+# TOPLU GÜNLÜK HESAP (DENKLİK SINIFLARI)
+# ----------------------------------------------------
+
+
+@app.post("/api/v1/admin/daily-words/precompute", dependencies=[Depends(require_admin)])
+def precompute_daily_words(
+    day: Optional[date] = None,
+    sample: int = 50,
+    db: Session = Depends(get_db),
+):
+    """
+    Günün kelimelerini tüm kullanıcılar için önceden hesaplar (örn. gece yarısından hemen sonra).
+    - Aynı sonucu belirleyen girdiler sınıf başına bir kez hesaplanır, kullanıcılara toplu yazılır
+    - Rapor: kullanıcı/sınıf sayıları, süre ve örneklemle ölçülen tahmini hızlanma
+    """
+    return precompute_day(db, day or date.today(), sample=sample)
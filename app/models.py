@@ -3,18 +3,33 @@ from typing import Optional
 from sqlmodel import SQLModel, Field
 
 
+class Pool(SQLModel, table=True):
+    """
+    Paylaşılan köşe taşı havuzu.
+    - feature_key: havuzu belirleyen özellik grubu (pools.feature_key) veya
+      kişiye özel/eski havuzlar için "content:<sha1>"
+    - words: JSON string (list[str]); kayıt değişmez, katalog değişince yeni Pool açılır
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    feature_key: str = Field(index=True, unique=True)
+    words: str
+
+
 class User(SQLModel, table=True):
     """
     Kullanıcı profili tablosu:
     - user_id: UUID string (primary key)
-    - cornerstone_pool: JSON string olarak saklanan kelime listesi
+    - pool_id: paylaşılan Pool kaydı
+    - cornerstone_pool: eski, kullanıcı başına JSON havuz (göç sonrası boş)
     """
     user_id: str = Field(default=None, primary_key=True)
     first_name: str
     last_name: str
     birth_date: datetime
     birth_place: str
-    cornerstone_pool: str  # JSON string (list[str])
+    cornerstone_pool: str = ""  # JSON string (list[str]) – sadece göç edilmemiş kayıtlar
+    pool_id: Optional[int] = Field(default=None, foreign_key="pool.id", index=True)
+    profile_version: Optional[int] = Field(default=1)  # değişince profil claim'li token'lar geçersiz
 
 
 class DailyWord(SQLModel, table=True):
@@ -23,9 +38,22 @@ class DailyWord(SQLModel, table=True):
     Aynı user_id + date için tek satır (cache/log işlevi).
     """
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: str = Field(foreign_key="user.user_id")
+    user_id: str = Field(foreign_key="user.user_id", index=True)  # kullanıcı bazlı export/sorgular
     date: date
     word1: str
     word2: str
     motto: str
+    strategy: Optional[str] = None  # üreten kelime stratejisi (None: eski kayıt)
+    anchor: Optional[str] = Field(default=None, index=True)  # word1'i seçen relationship_map anahtarı
 
+
+
+class CatalogSnapshot(SQLModel, table=True):
+    """
+    Anahtar kelime kataloglarının (app/data/*.json) senkronize edilmiş son hali.
+    Katalog değişikliklerinde sadece etkilenen havuz/satırları yeniden
+    hesaplamak için fark (diff) tabanı olarak kullanılır.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime
+    payload: str  # JSON string ({dosya_adı: içerik})
@@ -1,5 +1,6 @@
 import swisseph as swe
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Tuple
 from .geo import resolve_place
 
@@ -37,16 +38,30 @@ def zodiac_sign(lon: float) -> str:
     return signs[int(lon // 30)]
 
 
-# Kullanıcının doğum haritası: Güneş, Ay, ASC
-def compute_natal(first_name: str, last_name: str, birth_date: datetime, birth_place: str):
-    lat, lon, tz = resolve_place(birth_place)
-    jd_ut = swe.julday(
+def _birth_jd(birth_date: datetime) -> float:
+    return swe.julday(
         birth_date.year,
         birth_date.month,
         birth_date.day,
         birth_date.hour + birth_date.minute / 60.0 - 3.0  # TR için UTC offset
     )
 
+
+# Sadece natal Güneş: doğum yeri ve ev hesabı gerekmez (havuz anahtarı, toplu hesap)
+@lru_cache(maxsize=65536)
+def compute_sun_lon(birth_date: datetime) -> float:
+    return swe.calc_ut(_birth_jd(birth_date), swe.SUN)[0][0]
+
+
+def compute_sun_sign(birth_date: datetime) -> str:
+    return zodiac_sign(compute_sun_lon(birth_date))
+
+
+# Kullanıcının doğum haritası: Güneş, Ay, ASC
+def compute_natal(first_name: str, last_name: str, birth_date: datetime, birth_place: str):
+    lat, lon, tz = resolve_place(birth_place)
+    jd_ut = _birth_jd(birth_date)
+
     # Sun
     sun = swe.calc_ut(jd_ut, swe.SUN)[0]
     sun_lon = sun[0]
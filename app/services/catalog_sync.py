@@ -0,0 +1,411 @@
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, or_, update
+from sqlmodel import Session, select
+
+from ..models import Pool, User, DailyWord, CatalogSnapshot
+from .numerology import date_to_digit
+from .words_engine import (
+    POOL_CATALOGS,
+    DAILY_CATALOGS,
+    load_json,
+    build_pool_from_features,
+)
+from .daily import compute_daily_words, daily_cache_key
+from .word_strategies import WordStrategy, get_strategy
+from ..cache import get_shared_cache
+from .profile import note_profile_versions
+from .pools import (
+    RETIRED_PREFIX,
+    feature_key,
+    parse_feature_key,
+    resolve_pool,
+    intern_pool,
+    retire_pool,
+    clear_memo,
+)
+
+# Havuza her katalog girdisinin ilk kaç kelimesi giriyor (build_cornerstone_pool ile aynı)
+POOL_SLICE = 5
+BATCH_SIZE = 1000
+
+
+@dataclass
+class CatalogDiff:
+    """
+    İki katalog sürümü arasındaki değişen girdiler: {dosya_adı: {anahtar, ...}}.
+    - changed: havuzları (ilk POOL_SLICE kelime) ve relationship_map'i etkileyenler
+    - numerology_changed: günlük numeroloji kelimesi tüm listeyi kullandığı için
+      listenin tamamı değişen rakamlar
+    """
+    changed: Dict[str, Set[str]] = field(default_factory=dict)
+    numerology_changed: Set[str] = field(default_factory=set)
+    templates_changed: bool = False
+
+    @property
+    def empty(self) -> bool:
+        return not self.changed and not self.numerology_changed and not self.templates_changed
+
+
+def load_catalogs() -> Dict[str, Any]:
+    """Diskteki güncel katalogları yükler."""
+    return {name: load_json(name) for name in POOL_CATALOGS + DAILY_CATALOGS}
+
+
+def latest_snapshot(session: Session) -> Optional[Dict[str, Any]]:
+    """En son kaydedilen katalog sürümü (yoksa None)."""
+    snap = session.exec(
+        select(CatalogSnapshot).order_by(CatalogSnapshot.id.desc())
+    ).first()
+    return json.loads(snap.payload) if snap else None
+
+
+def save_snapshot(session: Session, catalogs: Dict[str, Any]) -> None:
+    session.add(
+        CatalogSnapshot(
+            created_at=datetime.now(timezone.utc),
+            payload=json.dumps(catalogs, ensure_ascii=False),
+        )
+    )
+
+
+def ensure_snapshot(session: Session) -> bool:
+    """
+    Kayıtlı sürüm yoksa güncel katalogları taban olarak kaydeder (uygulama açılışında).
+    Böylece ilk senkrondan önce yapılan katalog düzenlemeleri sessizce taban olmaz.
+    """
+    if latest_snapshot(session) is not None:
+        return False
+    save_snapshot(session, load_catalogs())
+    session.commit()
+    return True
+
+
+def diff_catalogs(old: Dict[str, Any], new: Dict[str, Any]) -> CatalogDiff:
+    """
+    Girdi bazında fark çıkarır.
+    - Havuz katalogları: havuza giren ilk POOL_SLICE kelime değiştiyse girdi değişmiştir
+    - relationship_map: ilişkili kelime listesi değişen anahtarlar
+    - numerology_keywords: günlük kelime için listenin tamamı (sıra/uzunluk) karşılaştırılır
+    - motto_templates: liste değiştiyse tüm mottolar etkilenir
+    """
+    diff = CatalogDiff()
+    for name in POOL_CATALOGS + ("relationship_map.json",):
+        a = old.get(name, {})
+        b = new.get(name, {})
+        limit = POOL_SLICE if name in POOL_CATALOGS else None
+        keys = {
+            k for k in set(a) | set(b)
+            if a.get(k, [])[:limit] != b.get(k, [])[:limit]
+        }
+        if keys:
+            diff.changed[name] = keys
+    a = old.get("numerology_keywords.json", {})
+    b = new.get("numerology_keywords.json", {})
+    diff.numerology_changed = {k for k in set(a) | set(b) if a.get(k) != b.get(k)}
+    diff.templates_changed = old.get("motto_templates.json") != new.get("motto_templates.json")
+    return diff
+
+
+def build_keyword_index(session: Session) -> Dict[str, Set[int]]:
+    """
+    Anahtar kelime → o kelimeyi içeren (aktif) Pool kayıtları.
+    Havuzlar paylaşıldığı için indeks kullanıcı sayısından değil, farklı havuz
+    sayısından büyür; kullanıcılara pool_id üzerinden ulaşılır.
+    """
+    index: Dict[str, Set[int]] = {}
+    stmt = select(Pool.id, Pool.feature_key, Pool.words).execution_options(yield_per=BATCH_SIZE)
+    for pool_id, key, words_json in session.exec(stmt):
+        if key.startswith(RETIRED_PREFIX):
+            continue
+        for w in json.loads(words_json):
+            index.setdefault(w, set()).add(pool_id)
+    return index
+
+
+def candidate_pools(
+    diff: CatalogDiff,
+    old: Dict[str, Any],
+    index: Dict[str, Set[int]],
+) -> Optional[Set[int]]:
+    """
+    Değişebilecek havuzlar.
+    Bir girdinin eski ilk 5 kelimesinin hepsi, o girdiye bağlı her havuzda
+    bulunur; kesişim aday kümesini verir. Eski girdi boşsa (yeni anahtar)
+    indeksle daraltılamaz → None (tüm havuzlar taranır).
+    """
+    found: Set[int] = set()
+    for name in POOL_CATALOGS:
+        for key in diff.changed.get(name, ()):
+            old_words = old.get(name, {}).get(key, [])[:POOL_SLICE]
+            if not old_words:
+                return None
+            sets = [index.get(w, set()) for w in old_words]
+            found |= set.intersection(*sets)
+    return found
+
+
+def _iter_pools(session: Session, pool_ids: Optional[Set[int]]) -> Iterable[Pool]:
+    stmt = select(Pool).where(~Pool.feature_key.startswith(RETIRED_PREFIX))
+    if pool_ids is None:
+        yield from session.exec(stmt).all()
+        return
+    ids = sorted(pool_ids)
+    for i in range(0, len(ids), BATCH_SIZE):
+        yield from session.exec(stmt.where(Pool.id.in_(ids[i:i + BATCH_SIZE]))).all()
+
+
+@dataclass
+class PoolChanges:
+    """
+    - by_pool: eski Pool.id → (yeni anahtar, yeni kelimeler) (özellik anahtarlı havuzlar)
+    - by_user: user_id → (yeni anahtar, yeni kelimeler) (kişiye özel/eski içerik havuzları)
+    - users: etkilenen kullanıcı → (yeni kelimeler, yeni profil sürümü)
+    """
+    by_pool: Dict[int, Tuple[str, List[str]]] = field(default_factory=dict)
+    by_user: Dict[str, Tuple[str, List[str]]] = field(default_factory=dict)
+    users: Dict[str, Tuple[List[str], int]] = field(default_factory=dict)
+
+
+def _orphaned_users(session: Session) -> List[User]:
+    """
+    Emekliye ayrılmış havuza bağlı kullanıcılar: senkron commit olmadan hemen önce
+    başka bir worker'da eski havuza bağlanan kayıtlar. Her senkronda yeniden çözülür.
+    """
+    stmt = (
+        select(User)
+        .join(Pool, User.pool_id == Pool.id)
+        .where(Pool.feature_key.startswith(RETIRED_PREFIX))
+    )
+    return session.exec(stmt).all()
+
+
+def _pool_changes(
+    session: Session,
+    diff: CatalogDiff,
+    old: Dict[str, Any],
+    new: Dict[str, Any],
+    report: Dict[str, Any],
+    orphans: List[User],
+) -> PoolChanges:
+    changes = PoolChanges()
+    for user in orphans:
+        changes.by_user[user.user_id] = resolve_pool(
+            user.first_name, user.last_name, user.birth_date, user.birth_place
+        )
+    if not any(name in diff.changed for name in POOL_CATALOGS):
+        candidates: Optional[Set[int]] = set()
+    else:
+        candidates = candidate_pools(diff, old, build_keyword_index(session))
+    for pool in _iter_pools(session, candidates):
+        report["candidate_pools"] += 1
+        stored = json.loads(pool.words)
+        features = parse_feature_key(pool.feature_key)
+        if features is not None:
+            words = build_pool_from_features(features, new)
+            if len(words) <= 50:
+                # Özellikten tüm grup için tek seferde yeniden üretilir (swisseph yok)
+                if words != stored:
+                    changes.by_pool[pool.id] = (feature_key(features), words)
+                continue
+        # İçerik anahtarlı (veya artık 50'yi aşan) havuz: üyeler tek tek çözülür
+        for user in session.exec(select(User).where(User.pool_id == pool.id)).all():
+            key, words = resolve_pool(user.first_name, user.last_name, user.birth_date, user.birth_place)
+            if words != stored:
+                changes.by_user[user.user_id] = (key, words)
+
+    # Etkilenen kullanıcılar + yeni profil sürümleri
+    pool_ids = sorted(changes.by_pool)
+    for i in range(0, len(pool_ids), BATCH_SIZE):
+        stmt = select(User.user_id, User.pool_id, User.profile_version).where(
+            User.pool_id.in_(pool_ids[i:i + BATCH_SIZE])
+        )
+        for user_id, pool_id, version in session.exec(stmt):
+            changes.users[user_id] = (changes.by_pool[pool_id][1], (version or 1) + 1)
+    user_ids = sorted(changes.by_user)
+    for i in range(0, len(user_ids), BATCH_SIZE):
+        stmt = select(User.user_id, User.profile_version).where(
+            User.user_id.in_(user_ids[i:i + BATCH_SIZE])
+        )
+        for user_id, version in session.exec(stmt):
+            changes.users[user_id] = (changes.by_user[user_id][1], (version or 1) + 1)
+    return changes
+
+
+def _apply_pool_changes(session: Session, changes: PoolChanges) -> None:
+    """
+    Pool kayıtları değişmez: eski havuz emekliye ayrılır, yeni havuz açılır ve
+    kullanıcılar (profil sürümü artırılarak) yeni havuza taşınır.
+    """
+    new_ids: Dict[int, int] = {}
+    for old_id, (key, words) in changes.by_pool.items():
+        retire_pool(session, session.get(Pool, old_id))
+    session.flush()
+    for old_id, (key, words) in changes.by_pool.items():
+        new_ids[old_id] = intern_pool(session, key, words)
+
+    for old_id, new_id in new_ids.items():
+        session.execute(
+            update(User)
+            .where(User.pool_id == old_id)
+            .values(pool_id=new_id, profile_version=func.coalesce(User.profile_version, 1) + 1)
+        )
+    _bulk_update(session, User, [
+        {
+            "user_id": user_id,
+            "pool_id": intern_pool(session, key, words),
+            "profile_version": changes.users[user_id][1],
+        }
+        for user_id, (key, words) in changes.by_user.items()
+    ])
+
+
+def _row_affected(
+    rec: DailyWord,
+    diff: CatalogDiff,
+    strategy: WordStrategy,
+    changed_users: Dict[str, Any],
+) -> bool:
+    if rec.strategy != strategy.name:
+        # Başka stratejiyle üretilmiş satır ilk okunduğunda zaten yeniden hesaplanır
+        return False
+    if rec.user_id in changed_users:
+        return True
+    if diff.templates_changed and "motto_templates.json" in strategy.catalogs:
+        return True
+    rel_keys = diff.changed.get("relationship_map.json")
+    if rel_keys and (rec.anchor is None or rec.anchor in rel_keys):
+        # anchor'suz (eski) satırlar yeniden hesaplanır ve anchor'ları doldurulur
+        return True
+    # Tek günlerde anchor kelimesi numeroloji kataloğundan gelir (pick_word2)
+    num_digits = diff.numerology_changed
+    if num_digits and "numerology_keywords.json" in strategy.catalogs and rec.date.toordinal() % 2 == 1:
+        dt = datetime.combine(rec.date, datetime.min.time())
+        return str(date_to_digit(dt)) in num_digits
+    return False
+
+
+def _row_filter(diff: CatalogDiff, strategy: WordStrategy, changes: "PoolChanges"):
+    """
+    Sadece relationship_map değiştiyse adaylar DailyWord.anchor indeksiyle
+    DB'de daraltılır (tüm satırlar taranmaz); diğer durumlarda None.
+    """
+    if changes.users or diff.numerology_changed or (
+        diff.templates_changed and "motto_templates.json" in strategy.catalogs
+    ):
+        return None
+    rel_keys = sorted(diff.changed.get("relationship_map.json", ()))
+    return or_(DailyWord.anchor.in_(rel_keys), DailyWord.anchor.is_(None))
+
+
+def _bulk_update(session: Session, model, rows: List[Dict[str, Any]]) -> None:
+    """Birincil anahtara göre toplu UPDATE (executemany), BATCH_SIZE'lık parçalarla."""
+    for i in range(0, len(rows), BATCH_SIZE):
+        session.execute(update(model), rows[i:i + BATCH_SIZE])
+
+
+def sync_catalogs(session: Session, dry_run: bool = True, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Son senkronize sürüm ile diskteki katalogları karşılaştırır ve sadece
+    etkilenen havuzları (Pool) ve bugünkü/gelecek DailyWord satırlarını
+    toplu olarak yeniden hesaplar.
+    - dry_run=True: hiçbir şey yazılmaz, sadece kaç kullanıcı/satırın değişeceği raporlanır
+    - İlk çalıştırmada (kayıtlı sürüm yoksa) mevcut kataloglar taban olarak kaydedilir
+    - Emekli havuza bağlı kalmış kullanıcılar katalog değişmese de güncel havuza taşınır
+    """
+    today = today or date.today()
+    new = load_catalogs()
+    old = latest_snapshot(session)
+
+    if old is None:
+        if not dry_run:
+            save_snapshot(session, new)
+            session.commit()
+        return {"dry_run": dry_run, "baseline": True, "changed_entries": {}}
+
+    diff = diff_catalogs(old, new)
+    report: Dict[str, Any] = {
+        "dry_run": dry_run,
+        "baseline": False,
+        "changed_entries": {k: sorted(v) for k, v in diff.changed.items()},
+        "numerology_daily_changed": sorted(diff.numerology_changed),
+        "templates_changed": diff.templates_changed,
+        "candidate_pools": 0,
+        "changed_pools": 0,
+        "changed_users": 0,
+        "candidate_rows": 0,
+        "changed_rows": 0,
+        "orphaned_users": 0,
+    }
+    orphans = _orphaned_users(session)
+    report["orphaned_users"] = len(orphans)
+    if diff.empty and not orphans:
+        return report
+
+    # 1) Havuzlar (+ emekli havuzda kalmış kullanıcılar)
+    changes = PoolChanges()
+    if orphans or any(name in diff.changed for name in POOL_CATALOGS):
+        changes = _pool_changes(session, diff, old, new, report, orphans)
+        report["changed_pools"] = len(changes.by_pool)
+        report["changed_users"] = len(changes.users)
+
+    # 2) Bugün ve sonrası için DailyWord satırları
+    strategy = get_strategy()
+    changed_users = changes.users
+    users: Dict[str, User] = {}
+    row_updates: List[Dict[str, Any]] = []
+    stale_keys: List[str] = []
+    stmt = select(DailyWord).where(
+        DailyWord.date >= today, DailyWord.strategy == strategy.name
+    )
+    row_filter = _row_filter(diff, strategy, changes)
+    if row_filter is not None:
+        stmt = stmt.where(row_filter)
+    stmt = stmt.order_by(DailyWord.user_id).execution_options(yield_per=BATCH_SIZE)
+    for rec in session.exec(stmt):
+        if not _row_affected(rec, diff, strategy, changed_users):
+            continue
+        report["candidate_rows"] += 1
+        user = users.get(rec.user_id)
+        if user is None:
+            # Satırlar user_id'ye göre sıralı: önbellekte tek kullanıcı tutmak yeterli
+            users.clear()
+            user = users[rec.user_id] = session.get(User, rec.user_id)
+        if user is None:
+            continue
+        new_pool = changed_users.get(rec.user_id)
+        word1, word2, motto, anchor = compute_daily_words(
+            user, rec.date, new_pool[0] if new_pool else None, strategy.name
+        )
+        changed = (word1, word2, motto) != (rec.word1, rec.word2, rec.motto)
+        if changed:
+            report["changed_rows"] += 1
+        if not dry_run and (changed or rec.anchor != anchor):
+            row_updates.append({
+                "id": rec.id,
+                "word1": word1,
+                "word2": word2,
+                "motto": motto,
+                "anchor": anchor,
+            })
+            if changed:
+                stale_keys.append(daily_cache_key(rec.user_id, rec.date, strategy.name))
+
+    # Yazma işlemleri cursor'lar kapandıktan sonra, toplu olarak
+    if not dry_run:
+        _apply_pool_changes(session, changes)
+        _bulk_update(session, DailyWord, row_updates)
+        save_snapshot(session, new)
+        session.commit()
+        clear_memo()
+        # Paylaşılan cache: eski token'lar düşer, değişen günlük sonuçlar silinir
+        note_profile_versions({uid: version for uid, (_, version) in changes.users.items()})
+        cache = get_shared_cache()
+        if cache is not None:
+            for i in range(0, len(stale_keys), BATCH_SIZE):
+                cache.delete(stale_keys[i:i + BATCH_SIZE])
+
+    return report
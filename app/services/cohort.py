@@ -0,0 +1,230 @@
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import insert, update
+from sqlmodel import Session, select
+
+from ..cache import get_shared_cache
+from ..config import settings
+from ..models import User, DailyWord
+from .astrology import angle_relation
+from .daily import daily_cache_entry, daily_cache_key
+from .pools import ensure_cornerstone_pool, get_pool_words, has_pool
+from .words_engine import pick_word1
+from .word_strategies import (
+    DailyInputs,
+    WordStrategy,
+    get_strategy,
+    run_strategy,
+    run_strategy_row,
+)
+
+# ----------------------------------------------------
+# DENKLİK SINIFLARINA GÖRE TOPLU GÜNLÜK HESAP
+# ----------------------------------------------------
+#
+# Bir gün için:
+# - transits ve numeroloji kelimesi herkes için aynıdır (gün sınıfı)
+# - astro kelimesi sadece natal Güneş – transit Mars açısına bağlıdır (en fazla 6 sınıf)
+# - köşe taşı (cornerstone_word) sadece (havuz, anchor kelimesi) ikilisine bağlıdır
+# Bu girdiler sınıf başına bir kez hesaplanır; kişiye özel girdiler (enerji
+# kelimesi vb.) strateji tarafından kullanıcı başına, ucuz olarak üretilir.
+
+BATCH_SIZE = 1000
+
+# Gün boyunca herkes için aynı olan girdiler
+DAY_INPUTS = ("transits", "numerology_word")
+
+
+@dataclass
+class CohortReport:
+    day: str
+    strategy: str
+    users: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    classes: Dict[str, int] = field(default_factory=dict)
+    elapsed_s: float = 0.0  # hesap + toplu yazma
+    compute_s: float = 0.0  # sadece hesap (baseline ile karşılaştırılan faz)
+    write_s: float = 0.0
+    per_user_ms: float = 0.0
+    sample_users: int = 0
+    per_user_baseline_ms: float = 0.0
+    estimated_baseline_s: float = 0.0
+    speedup: float = 0.0  # estimated_baseline_s / compute_s
+
+
+class DailyCohort:
+    """Bir gün + strateji için sınıf memo'ları."""
+
+    def __init__(self, current_day: date, strategy: WordStrategy):
+        self.day = current_day
+        self.strategy = strategy
+        self._memo: Dict[str, Dict[Hashable, Any]] = {}
+
+    def shared(self, name: str, key: Hashable, compute) -> Any:
+        memo = self._memo.setdefault(name, {})
+        if key not in memo:
+            memo[key] = compute()
+        return memo[key]
+
+    def class_counts(self) -> Dict[str, int]:
+        return {name: len(memo) for name, memo in self._memo.items()}
+
+    def inputs(self, user: User) -> "CohortInputs":
+        return CohortInputs(self, user)
+
+
+def _pool_key(user: User) -> Hashable:
+    return user.pool_id if user.pool_id is not None else ("legacy", user.cornerstone_pool)
+
+
+class CohortInputs(DailyInputs):
+    """Sınıf seviyesindeki girdileri DailyCohort memo'larından veren DailyInputs."""
+
+    def __init__(self, cohort: DailyCohort, user: User):
+        super().__init__(user, cohort.day)
+        self.cohort = cohort
+
+    def _provide(self, name: str) -> Any:
+        c = self.cohort
+        base = super()._provide
+        if name in DAY_INPUTS:
+            return c.shared(name, None, lambda: base(name))
+        if name == "astro_word":
+            # sınıf = natal Güneş – transit Mars açısı (daily_astro_word'ün tek girdisi)
+            aspect = angle_relation(self["sun_lon"], self["transits"]["mars"])
+            return c.shared(name, aspect, lambda: base(name))
+        if name == "pool":
+            if self.user.pool_id is not None:
+                return c.shared(name, self.user.pool_id, lambda: get_pool_words(self.user.pool_id))
+            return c.shared(name, _pool_key(self.user), lambda: ensure_cornerstone_pool(self.user))
+        if name == "cornerstone_word":
+            anchor = self["anchor_word"]
+            return c.shared(
+                name,
+                (_pool_key(self.user), anchor),
+                lambda: pick_word1(anchor, self["pool"]),
+            )
+        return base(name)
+
+
+def _existing_rows(session: Session, current_day: date) -> Dict[str, Tuple[int, Optional[str]]]:
+    stmt = select(DailyWord.user_id, DailyWord.id, DailyWord.strategy).where(
+        DailyWord.date == current_day
+    )
+    return {user_id: (rec_id, strategy) for user_id, rec_id, strategy in session.exec(stmt)}
+
+
+def _iter_user_batches(session: Session):
+    """user_id üzerinden keyset sayfalama: yazmalar arasında açık cursor kalmaz."""
+    last = ""
+    while True:
+        batch = session.exec(
+            select(User).where(User.user_id > last).order_by(User.user_id).limit(BATCH_SIZE)
+        ).all()
+        if not batch:
+            return
+        last = batch[-1].user_id
+        yield batch
+
+
+def _baseline(strategy: WordStrategy, users: List[User], current_day: date) -> float:
+    """Kullanıcı başına klasik (sınıfsız) hesap süresi, saniye (sadece hesap, yazma yok)."""
+    if not users:
+        return 0.0
+    t0 = time.perf_counter()
+    for user in users:
+        run_strategy(strategy, user, current_day)
+    return (time.perf_counter() - t0) / len(users)
+
+
+def precompute_day(
+    session: Session,
+    current_day: date,
+    strategy_name: Optional[str] = None,
+    sample: int = 50,
+) -> Dict[str, Any]:
+    """
+    Günün sonuçlarını denklik sınıfı başına bir kez hesaplar ve tüm kullanıcılara
+    toplu INSERT/UPDATE ile dağıtır.
+    - Seçili stratejiyle bugünkü kaydı olan kullanıcılar atlanır
+    - Yazılan sonuçlar paylaşılan cache'e (varsa) de konur (gün dönümü isteklerinde DB'ye gidilmez)
+    - sample: sınıfsız kullanıcı başı maliyeti ölçmek için örneklem (0 → ölçme)
+    Rapor: kullanıcı vs. sınıf sayıları, süreler ve tahmini hızlanma. Hızlanma aynı
+    fazı karşılaştırır: sınıflı hesap süresi vs. sınıfsız hesap (ikisi de yazmasız;
+    örneklem ilk sayfa hesaplandıktan sonra, aynı sıcak memo'larla ölçülür).
+    """
+    strategy = get_strategy(strategy_name)
+    cohort = DailyCohort(current_day, strategy)
+    report = CohortReport(day=current_day.isoformat(), strategy=strategy.name)
+    existing = _existing_rows(session, current_day)
+
+    cache = get_shared_cache()
+    baseline: Optional[float] = None
+    compute = write = 0.0
+    for batch in _iter_user_batches(session):
+        t0 = time.perf_counter()
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        warm: Dict[str, Any] = {}
+        for user in batch:
+            if not has_pool(user):
+                continue
+            rec = existing.get(user.user_id)
+            if rec is not None and rec[1] == strategy.name:
+                report.skipped += 1
+                continue
+            report.users += 1
+            word1, word2, motto, anchor = run_strategy_row(
+                strategy, user, current_day, inputs=cohort.inputs(user)
+            )
+            row = {
+                "word1": word1,
+                "word2": word2,
+                "motto": motto,
+                "strategy": strategy.name,
+                "anchor": anchor,
+            }
+            warm[daily_cache_key(user.user_id, current_day, strategy.name)] = daily_cache_entry(
+                user, (word1, word2, motto)
+            )
+            if rec is None:
+                inserts.append({"user_id": user.user_id, "date": current_day, **row})
+            else:
+                updates.append({"id": rec[0], **row})
+        compute += time.perf_counter() - t0
+
+        if baseline is None:
+            # Sınıfsız (kullanıcı başına) maliyet: ilk sayfadan örneklem, sonuçlar yazılmaz
+            sample_users = [u for u in batch if has_pool(u)][:sample]
+            baseline = _baseline(strategy, sample_users, current_day)
+            report.sample_users = len(sample_users)
+
+        t0 = time.perf_counter()
+        if inserts:
+            session.execute(insert(DailyWord), inserts)
+        if updates:
+            session.execute(update(DailyWord), updates)
+        session.commit()
+        if cache is not None:
+            cache.set_many(warm, ttl=settings.DAILY_CACHE_TTL)
+        write += time.perf_counter() - t0
+        report.inserted += len(inserts)
+        report.updated += len(updates)
+
+    baseline = baseline or 0.0
+    report.compute_s = round(compute, 4)
+    report.write_s = round(write, 4)
+    report.elapsed_s = round(compute + write, 4)
+    report.classes = cohort.class_counts()
+    if report.users:
+        report.per_user_ms = round(compute / report.users * 1000, 3)
+    report.per_user_baseline_ms = round(baseline * 1000, 3)
+    report.estimated_baseline_s = round(baseline * report.users, 4)
+    if compute > 0:
+        report.speedup = round(report.estimated_baseline_s / compute, 2)
+    return asdict(report)
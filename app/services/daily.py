@@ -0,0 +1,87 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from ..cache import get_shared_cache
+from ..config import settings
+from ..models import User, DailyWord
+from .word_strategies import get_strategy, run_strategy_row
+
+# ----------------------------------------------------
+# GÜNLÜK KELİMELER: HESAP + DB/CACHE KAYDI
+# ----------------------------------------------------
+
+
+def compute_daily_words(
+    user: User,
+    current_day: date,
+    cs_pool: Optional[List[str]] = None,
+    strategy_name: Optional[str] = None,
+) -> Tuple[str, str, str, str]:
+    """
+    DB'ye dokunmadan word1, word2, motto ve anchor (relationship_map anahtarı)
+    üretir (seçili kelime stratejisiyle).
+    cs_pool verilirse kullanıcının kayıtlı havuzu yerine o kullanılır
+    (katalog senkronizasyonunda yeni havuzla yeniden hesap için).
+    """
+    preset = {"pool": cs_pool} if cs_pool is not None else None
+    return run_strategy_row(get_strategy(strategy_name), user, current_day, preset)
+
+
+def daily_cache_key(user_id: str, current_day: date, strategy: str) -> str:
+    return f"daily:{strategy}:{user_id}:{current_day.isoformat()}"
+
+
+def daily_cache_entry(user: User, words: Tuple[str, str, str]) -> Dict:
+    """Cache değeri; profil sürümü değişince kayıt kendiliğinden geçersiz sayılır."""
+    return {"pv": user.profile_version or 1, "w": list(words)}
+
+
+def get_or_create_daily_words(session: Session, user: User, current_day: date) -> Tuple[str, str, str]:
+    """
+    - Paylaşılan cache'te (CACHE_URL=redis://) güncel profil sürümüyle kayıt varsa onu döner
+      (process içi memory:// cache'te tutulmaz: diğer worker'lardaki senkron onu silemez).
+    - Aynı kullanıcı + aynı gün için seçili stratejiyle üretilmiş kayıt varsa **cache** olarak onu döner.
+    - Yoksa yeni word1, word2, motto üretir; DB'ye yazar.
+    - Başka bir stratejiyle üretilmiş eski kayıt yerinde güncellenir
+      (yazılan ile sunulan her zaman aynı).
+    """
+    strategy = settings.DAILY_WORD_STRATEGY
+    cache = get_shared_cache()
+    key = daily_cache_key(user.user_id, current_day, strategy)
+    if cache is not None:
+        entry = cache.get(key)
+        if entry and entry["pv"] == (user.profile_version or 1):
+            return tuple(entry["w"])
+
+    # DB kontrolü
+    q = session.exec(
+        select(DailyWord).where(
+            DailyWord.user_id == user.user_id,
+            DailyWord.date == current_day,
+        )
+    ).first()
+    if q and q.strategy == strategy:
+        words = (q.word1, q.word2, q.motto)
+        if cache is not None:
+            cache.set(key, daily_cache_entry(user, words), ttl=settings.DAILY_CACHE_TTL)
+        return words
+
+    word1, word2, motto, anchor = compute_daily_words(user, current_day, strategy_name=strategy)
+
+    # DB'ye kaydet
+    rec = q or DailyWord(user_id=user.user_id, date=current_day)
+    rec.word1 = word1
+    rec.word2 = word2
+    rec.motto = motto
+    rec.strategy = strategy
+    rec.anchor = anchor
+    session.add(rec)
+    session.commit()
+    session.refresh(rec)
+
+    words = (rec.word1, rec.word2, rec.motto)
+    if cache is not None:
+        cache.set(key, daily_cache_entry(user, words), ttl=settings.DAILY_CACHE_TTL)
+    return words
@@ -0,0 +1,174 @@
+import random
+from datetime import date
+
+from ..models import User
+
+# ----------------------------------------------------
+# ASTRO TABANLI KİŞİSEL "GÜNLÜK ENERJİ" ALGORİTMASI
+# ----------------------------------------------------
+
+ENERGY_WORDS_BY_ELEMENT = {
+    "fire": [
+        "Atılım",
+        "Cesaret",
+        "Tutku",
+        "Kıvılcım",
+        "Aksiyon",
+        "Yeniden Doğuş",
+        "Gözükaralık",
+        "Motivasyon",
+    ],
+    "earth": [
+        "Toplanma",
+        "Köklenme",
+        "Sabır",
+        "İstikrar",
+        "Dayanıklılık",
+        "Planlama",
+        "Somutlaşma",
+        "Denge",
+    ],
+    "air": [
+        "İlham",
+        "Merak",
+        "Fikir",
+        "İletişim",
+        "Bağlantı",
+        "Öğrenme",
+        "Bakış Açısı",
+        "Netlik",
+    ],
+    "water": [
+        "Şifa",
+        "Akış",
+        "Duyarlılık",
+        "Arınma",
+        "Empati",
+        "Kabulleniş",
+        "Derinleşme",
+        "Sakinleşme",
+    ],
+}
+
+ELEMENT_LABEL_TR = {
+    "fire": "ateş",
+    "earth": "toprak",
+    "air": "hava",
+    "water": "su",
+}
+
+
+def get_zodiac_element_from_birth(birth_dt) -> str:
+    """
+    Kullanıcının doğum tarihinden zodyak elementini çıkarır.
+    Element: fire / earth / air / water
+    """
+    if birth_dt is None:
+        return "earth"  # nötr
+
+    if hasattr(birth_dt, "date"):
+        birth_dt = birth_dt.date()
+
+    m = birth_dt.month
+    d = birth_dt.day
+
+    # Koç: 21 Mart – 19 Nisan (ateş)
+    if (m == 3 and d >= 21) or (m == 4 and d <= 19):
+        return "fire"
+    # Boğa: 20 Nisan – 20 Mayıs (toprak)
+    if (m == 4 and d >= 20) or (m == 5 and d <= 20):
+        return "earth"
+    # İkizler: 21 Mayıs – 20 Haziran (hava)
+    if (m == 5 and d >= 21) or (m == 6 and d <= 20):
+        return "air"
+    # Yengeç: 21 Haziran – 22 Temmuz (su)
+    if (m == 6 and d >= 21) or (m == 7 and d <= 22):
+        return "water"
+    # Aslan: 23 Temmuz – 22 Ağustos (ateş)
+    if (m == 7 and d >= 23) or (m == 8 and d <= 22):
+        return "fire"
+    # Başak: 23 Ağustos – 22 Eylül (toprak)
+    if (m == 8 and d >= 23) or (m == 9 and d <= 22):
+        return "earth"
+    # Terazi: 23 Eylül – 22 Ekim (hava)
+    if (m == 9 and d >= 23) or (m == 10 and d <= 22):
+        return "air"
+    # Akrep: 23 Ekim – 21 Kasım (su)
+    if (m == 10 and d >= 23) or (m == 11 and d <= 21):
+        return "water"
+    # Yay: 22 Kasım – 21 Aralık (ateş)
+    if (m == 11 and d >= 22) or (m == 12 and d <= 21):
+        return "fire"
+    # Oğlak: 22 Aralık – 19 Ocak (toprak)
+    if (m == 12 and d >= 22) or (m == 1 and d <= 19):
+        return "earth"
+    # Kova: 20 Ocak – 18 Şubat (hava)
+    if (m == 1 and d >= 20) or (m == 2 and d <= 18):
+        return "air"
+    # Balık: 19 Şubat – 20 Mart (su)
+    if (m == 2 and d >= 19) or (m == 3 and d <= 20):
+        return "water"
+
+    return "earth"
+
+
+def pick_personal_daily_energy_word(user: User, today: date) -> tuple[str, str]:
+    """
+    Kullanıcı + tarih + astro element'e göre deterministik bir günlük enerji kelimesi seçer.
+    DÖNÜŞ: (energy_word, element_key)
+
+    ÖNEMLİ: Seed artık user_id'ye değil, KİŞİSEL BİLGİLERE bağlı:
+    - first_name, last_name
+    - birth_date
+    - birth_place
+    - gün
+    Böylece aynı verilerle tekrar kayıt olunsa bile, aynı gün aynı kelime gelir.
+    """
+    birth_dt = getattr(user, "birth_date", None)
+    element = get_zodiac_element_from_birth(birth_dt)
+    words = ENERGY_WORDS_BY_ELEMENT.get(element, ENERGY_WORDS_BY_ELEMENT["earth"])
+
+    # Kişisel verileri toplayalım
+    first = (getattr(user, "first_name", "") or "").strip().upper()
+    last = (getattr(user, "last_name", "") or "").strip().upper()
+    birth_place = (getattr(user, "birth_place", "") or "").strip().upper()
+
+    if hasattr(birth_dt, "date"):
+        birth_str = birth_dt.date().isoformat()
+    elif birth_dt:
+        birth_str = birth_dt.isoformat()
+    else:
+        birth_str = "NO_BIRTH"
+
+    # Deterministik seed: Kişisel veriler + gün + element
+    seed_str = f"{first}-{last}-{birth_str}-{birth_place}-{today.isoformat()}-{element}"
+
+    rnd = random.Random(seed_str)
+    index = rnd.randint(0, len(words) - 1)
+
+    return words[index], element
+
+
+def build_motto(word1: str, energy_word: str, element_key: str) -> str:
+    """
+    Köşe taşı + günlük enerji + element bilgisine göre motto üretir.
+    """
+    element_label = ELEMENT_LABEL_TR.get(element_key, "toprak")
+
+    templates = [
+        "Bugün {energy} senin {element} enerjini uyandırırken, {corner} pusulan olmaya devam ediyor.",
+        "{energy} enerjisi bugün alanında; {corner} ise attığın her adımın merkezinde.",
+        "Gökyüzü bugün {element} tınısında: {energy} seni çağırıyor, {corner} rotanı sabitliyor.",
+        "Bugünün akışı {energy}; sen {corner} ile kendi hikâyeni yeniden yazıyorsun.",
+    ]
+
+    seed_str = f"{word1}-{energy_word}-{element_key}"
+    rnd = random.Random(seed_str)
+    idx = rnd.randint(0, len(templates) - 1)
+
+    template = templates[idx]
+    return template.format(
+        energy=energy_word,
+        corner=word1,
+        element=element_label,
+    )
@@ -0,0 +1,67 @@
+import json
+import zlib
+from typing import Iterator, Optional
+
+from sqlmodel import Session, select
+
+from ..config import settings
+from ..db import engine
+from ..models import DailyWord
+
+# Satırları tek tek değil, ~64 KB'lık parçalar halinde gönderiyoruz.
+CHUNK_SIZE = 64 * 1024
+
+
+def _row_to_line(rec: DailyWord) -> str:
+    return json.dumps(
+        {
+            "user_id": rec.user_id,
+            "date": rec.date.isoformat(),
+            "word1": rec.word1,
+            "word2": rec.word2,
+            "motto": rec.motto,
+        },
+        ensure_ascii=False,
+    ) + "\n"
+
+
+def iter_daily_word_lines(user_id: Optional[str] = None) -> Iterator[bytes]:
+    """
+    DailyWord geçmişini NDJSON olarak parça parça üretir.
+    - user_id verilirse sadece o kullanıcı, verilmezse tüm kullanıcılar
+    - yield_per ile sunucu tarafı cursor: bellek kullanımı satır sayısından bağımsız
+    - Oturum burada açılır; StreamingResponse, istek bağımlılıkları kapandıktan
+      sonra da akmaya devam ettiği için get_db oturumu kullanılamaz.
+    """
+    stmt = select(DailyWord)
+    if user_id is not None:
+        stmt = stmt.where(DailyWord.user_id == user_id)
+    stmt = stmt.order_by(DailyWord.id).execution_options(
+        yield_per=settings.EXPORT_YIELD_PER
+    )
+
+    with Session(engine) as session:
+        buf = []
+        size = 0
+        for rec in session.exec(stmt):
+            line = _row_to_line(rec).encode("utf-8")
+            buf.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield b"".join(buf)
+                buf.clear()
+                size = 0
+            # Kimlik haritasında birikmesin
+            session.expunge(rec)
+        if buf:
+            yield b"".join(buf)
+
+
+def gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Parça akışını gzip formatında sıkıştırarak aktarır."""
+    comp = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = comp.compress(chunk)
+        if out:
+            yield out
+    yield comp.flush()
@@ -0,0 +1,155 @@
+import logging
+import multiprocessing
+import queue
+import threading
+from datetime import datetime
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlmodel import Session
+
+from ..config import settings
+from ..db import engine
+from ..models import User
+from .pools import resolve_pool, intern_pool
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------
+# KAYIT SONRASI ARKA PLAN HAVUZ HESABI (ProcessPoolExecutor)
+# ----------------------------------------------------
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending: Dict[str, Future] = {}
+_lock = threading.Lock()
+_slots: Optional[threading.BoundedSemaphore] = None
+# Biten işlerin DB yazımı: done-callback executor'ın yönetim thread'inde çalışır,
+# orada bloklayan yazma diğer işlerin tamamlanmasını da bekletir → ayrı yazıcı thread
+_writes: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+_writer: Optional[threading.Thread] = None
+
+
+def start() -> None:
+    """Uygulama açılışında çağrılır (REGISTER_ASYNC_POOL açıksa)."""
+    global _executor, _slots, _writer
+    if _executor is None:
+        # fork, başka thread'ler kilit tutarken (örn. pools._lock) alınırsa çocuk
+        # process kilitli kopyada takılabilir → çocuklar temiz başlatılır
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _slots = threading.BoundedSemaphore(settings.POOL_QUEUE_LIMIT)
+        _writer = threading.Thread(target=_write_loop, name="pool-jobs-writer", daemon=True)
+        _writer.start()
+
+
+def shutdown() -> None:
+    """Bekleyen işler iptal edilir; havuzu boş kalan kullanıcılar ilk istekte hesaplanır."""
+    global _executor, _writer
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+    if _writer is not None:
+        _writes.put(None)
+        _writer.join()
+        _writer = None
+
+
+def submit(
+    user_id: str,
+    first_name: str,
+    last_name: str,
+    birth_date: datetime,
+    birth_place: str,
+) -> bool:
+    """
+    Kullanıcının havuz hesabını kuyruğa atar.
+    Havuz kapalıysa veya kuyruk doluysa False döner (çağıran satır içi hesaplar).
+    """
+    if _executor is None or not _slots.acquire(blocking=False):
+        return False
+    try:
+        fut = _executor.submit(
+            resolve_pool,
+            first_name,
+            last_name,
+            birth_date,
+            birth_place,
+        )
+    except RuntimeError:
+        # Executor kapanıyor
+        _slots.release()
+        return False
+    with _lock:
+        _pending[user_id] = fut
+    fut.add_done_callback(partial(_complete, user_id))
+    return True
+
+
+def _store(session: Session, user_id: str, key: str, words: List[str]) -> None:
+    """Havuzu paylaşılan Pool'a bağlar; sadece kullanıcının havuzu hâlâ boşsa yazar
+    (arka plan ve istek yolu yarışabilir)."""
+    pool_id = intern_pool(session, key, words)
+    session.execute(
+        update(User)
+        .where(User.user_id == user_id, User.pool_id.is_(None), User.cornerstone_pool == "")
+        .values(pool_id=pool_id)
+    )
+    session.commit()
+
+
+def _complete(user_id: str, fut: Future) -> None:
+    """Executor'ın yönetim thread'inde çalışır: sadece yazıcı kuyruğuna aktarır."""
+    _writes.put((user_id, fut))
+
+
+def _write_loop() -> None:
+    while True:
+        item = _writes.get()
+        if item is None:
+            return
+        user_id, fut = item
+        try:
+            if not fut.cancelled():
+                key, words = fut.result()
+                with Session(engine) as session:
+                    _store(session, user_id, key, words)
+        except Exception:
+            logger.exception("cornerstone pool job failed for user %s", user_id)
+        finally:
+            # Kuyruk sınırı yazma bitene kadar geçerli (yazılmayı bekleyen işler dahil)
+            _slots.release()
+            with _lock:
+                _pending.pop(user_id, None)
+
+
+def ensure_pool(session: Session, user: User) -> None:
+    """
+    daily_words'te havuz boşsa çağrılır:
+    - Arka plan işi varsa en fazla POOL_WAIT_SECONDS bekler
+    - İş yoksa (örn. yeniden başlatma) veya bitmediyse havuzu burada hesaplar
+    """
+    with _lock:
+        fut = _pending.get(user.user_id)
+
+    resolved: Optional[Tuple[str, List[str]]] = None
+    if fut is not None:
+        try:
+            resolved = fut.result(timeout=settings.POOL_WAIT_SECONDS)
+        except Exception:
+            # Zaman aşımı veya iş hatası: aşağıda satır içi hesaplanır
+            resolved = None
+
+    if resolved is None:
+        resolved = resolve_pool(
+            user.first_name,
+            user.last_name,
+            user.birth_date,
+            user.birth_place,
+        )
+
+    _store(session, user.user_id, *resolved)
+    session.refresh(user)
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import object_session
+from sqlmodel import Session, select
+
+from ..db import engine
+from ..models import CatalogSnapshot, Pool, User
+from .words_engine import (
+    PoolFeatures,
+    catalog_version,
+    pool_features,
+    build_pool_from_features,
+    limit_personal_pool,
+)
+
+# ----------------------------------------------------
+# PAYLAŞILAN KÖŞE TAŞI HAVUZLARI
+# ----------------------------------------------------
+
+CONTENT_PREFIX = "content:"
+RETIRED_PREFIX = "retired:"
+BATCH_SIZE = 1000
+
+# Process içi memo (her uvicorn worker'ı ve havuz alt process'i kendi kopyasını tutar):
+# - _words_by_key: özellik anahtarı → kelimeler; diskteki katalog sürümüne bağlı
+#   (catalog_version değişince boşaltılır; DB gerektirmez, alt process'lerde de geçerli)
+# - _id_by_key: anahtar → Pool.id; katalog senkron nesline (son CatalogSnapshot.id) bağlı,
+#   başka bir process'teki senkron havuzu emekliye ayırınca boşaltılır
+# - _words_by_id: Pool.id → kelimeler (Pool kayıtları değişmez, güvenle saklanır)
+_words_by_key: Dict[str, List[str]] = {}
+_words_version: Optional[Tuple] = None
+_id_by_key: Dict[str, int] = {}
+_id_generation: Optional[int] = None
+_words_by_id: Dict[int, List[str]] = {}
+_lock = threading.Lock()
+
+
+def feature_key(features: PoolFeatures) -> str:
+    return "|".join(str(x) for x in features)
+
+
+def parse_feature_key(key: str) -> Optional[PoolFeatures]:
+    """Özellik anahtarını geri çözer; içerik/emekli anahtarlar için None."""
+    if key.startswith((CONTENT_PREFIX, RETIRED_PREFIX)):
+        return None
+    sun, animal, element, *nums = key.split("|")
+    return (sun, animal, element, *(int(n) for n in nums))
+
+
+def content_key(words: List[str]) -> str:
+    """Özelliklerden yeniden üretilemeyen (kişiye özel / eski) havuzlar için anahtar."""
+    raw = json.dumps(words, ensure_ascii=False)
+    return CONTENT_PREFIX + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def words_for_features(features: PoolFeatures) -> List[str]:
+    global _words_version
+    version = catalog_version()
+    key = feature_key(features)
+    with _lock:
+        if version != _words_version:
+            _words_by_key.clear()
+            _words_version = version
+        words = _words_by_key.get(key)
+    if words is None:
+        words = build_pool_from_features(features)
+        with _lock:
+            if version == _words_version:
+                _words_by_key[key] = words
+    return words
+
+
+def _check_generation(session: Session) -> None:
+    """Memo'daki Pool.id'ler son katalog senkronundan eskiyse boşaltılır."""
+    global _id_generation
+    generation = session.exec(select(func.max(CatalogSnapshot.id))).one() or 0
+    with _lock:
+        if generation != _id_generation:
+            _id_by_key.clear()
+            _id_generation = generation
+
+
+def resolve_pool(
+    first_name: str,
+    last_name: str,
+    birth_date: datetime,
+    birth_place: str,
+) -> Tuple[str, List[str]]:
+    """
+    Kullanıcının havuz anahtarı + kelimeleri (DB'ye dokunmaz; process havuzunda da çalışır).
+    Aynı özellik grubundaki herkes aynı anahtarı paylaşır; 50 kelimeyi aşan
+    havuzlar kişiye özel olduğundan içerik anahtarı alır.
+    """
+    features = pool_features(first_name, last_name, birth_date)
+    words = words_for_features(features)
+    if len(words) > 50:
+        words = limit_personal_pool(words, first_name, last_name, birth_place)
+        return content_key(words), words
+    return feature_key(features), words
+
+
+def intern_pool(session: Session, key: str, words: List[str]) -> int:
+    """
+    Anahtar için Pool.id döner; yoksa oluşturur.
+    Eşzamanlı kayıtta unique ihlali olursa mevcut kaydı kullanır.
+    """
+    _check_generation(session)
+    return _intern(session, key, words)
+
+
+def _intern(session: Session, key: str, words: List[str]) -> int:
+    """intern_pool'un nesil kontrolsüz hali (toplu işlerde kontrol parti başına bir kez)."""
+    pool_id = _id_by_key.get(key)
+    if pool_id is not None:
+        return pool_id
+
+    pool = session.exec(select(Pool).where(Pool.feature_key == key)).first()
+    if pool is None:
+        try:
+            with session.begin_nested():
+                pool = Pool(feature_key=key, words=json.dumps(words, ensure_ascii=False))
+                session.add(pool)
+        except IntegrityError:
+            pool = session.exec(select(Pool).where(Pool.feature_key == key)).one()
+
+    with _lock:
+        _id_by_key[key] = pool.id
+        _words_by_id[pool.id] = json.loads(pool.words)
+    return pool.id
+
+
+def get_pool_words(pool_id: int, session: Optional[Session] = None) -> List[str]:
+    words = _words_by_id.get(pool_id)
+    if words is not None:
+        return words
+
+    if session is not None:
+        pool = session.get(Pool, pool_id)
+    else:
+        with Session(engine) as s:
+            pool = s.get(Pool, pool_id)
+    words = json.loads(pool.words)
+    with _lock:
+        _words_by_id[pool_id] = words
+    return words
+
+
+def ensure_cornerstone_pool(u: User, session: Optional[Session] = None) -> List[str]:
+    """
+    Kullanıcının köşe taşı havuzu.
+    - pool_id varsa paylaşılan Pool kaydından (process içi memo ile)
+    - Yoksa eski User.cornerstone_pool JSON string'inden
+    """
+    if u.pool_id is not None:
+        return get_pool_words(u.pool_id, session or object_session(u))
+    return json.loads(u.cornerstone_pool)
+
+
+def has_pool(user: User) -> bool:
+    return user.pool_id is not None or bool(user.cornerstone_pool)
+
+
+def assign_pool(session: Session, user: User) -> int:
+    """Kullanıcıya paylaşılan havuzu bağlar (commit çağırana aittir)."""
+    key, words = resolve_pool(user.first_name, user.last_name, user.birth_date, user.birth_place)
+    user.pool_id = intern_pool(session, key, words)
+    return user.pool_id
+
+
+def retire_pool(session: Session, pool: Pool) -> None:
+    """
+    Katalog değişikliğinde eski havuz anahtarı serbest bırakılır (kayıt silinmez,
+    hâlâ ona bağlı kullanıcılar/eski token'lar için okunabilir kalır).
+    """
+    pool.feature_key = f"{RETIRED_PREFIX}{pool.id}:{pool.feature_key}"
+    session.add(pool)
+    clear_memo()
+
+
+def clear_memo() -> None:
+    """
+    Katalog değişince anahtar → havuz eşlemeleri yeniden hesaplanmalı.
+    (Diğer process'ler bunu katalog sürümü / senkron nesli üzerinden kendileri fark eder.)
+    """
+    global _words_version, _id_generation
+    with _lock:
+        _words_by_key.clear()
+        _id_by_key.clear()
+        _words_version = _id_generation = None
+
+
+# ----------------------------------------------------
+# GÖÇ: kullanıcı başına JSON havuz → paylaşılan Pool
+# ----------------------------------------------------
+
+
+def migrate_user_pools(session: Session) -> Dict[str, int]:
+    """
+    cornerstone_pool JSON'u dolu ve pool_id'si boş kullanıcıları paylaşılan
+    Pool kayıtlarına taşır (tekrarlar tek kayıtta birleşir), JSON kolonu boşaltılır.
+    - Saklanan havuz güncel kataloglardan üretilenle aynıysa özellik anahtarı kullanılır
+    - Farklıysa (eski katalog, kişiye özel) içerik anahtarıyla korunur
+    Toplu (BATCH_SIZE) işlenir; tekrar çalıştırmak güvenlidir.
+    Açılışta değil, admin uç noktasından bir kez çalıştırılır (taşınmamış kullanıcılar
+    bu arada JSON kolonundan okunmaya devam eder).
+    """
+    users = 0
+    pool_ids = set()
+    while True:
+        batch = session.exec(
+            select(User)
+            .where(User.pool_id.is_(None), User.cornerstone_pool != "")
+            .limit(BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+
+        _check_generation(session)
+        rows = []
+        for user in batch:
+            stored = json.loads(user.cornerstone_pool)
+            key, words = resolve_pool(
+                user.first_name, user.last_name, user.birth_date, user.birth_place
+            )
+            if words != stored:
+                key, words = content_key(stored), stored
+            pool_id = _intern(session, key, words)
+            pool_ids.add(pool_id)
+            rows.append({"user_id": user.user_id, "pool_id": pool_id, "cornerstone_pool": ""})
+
+        session.execute(update(User), rows)
+        session.commit()
+        users += len(rows)
+
+    return {"users": users, "pools": len(pool_ids)}
@@ -0,0 +1,69 @@
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from ..auth import TokenClaims
+from ..cache import get_shared_cache
+from ..config import settings
+from ..models import User
+from .daily import daily_cache_key
+
+# ----------------------------------------------------
+# PROFİL SÜRÜMÜ + TOKEN PROFİL CLAIM'LERİ
+# ----------------------------------------------------
+#
+# Güncel profil sürümleri paylaşılan cache'te tutulur (pv:<user_id>), böylece bir
+# worker'daki sürüm artışı diğer worker/node'lardaki eski token'ları da geçersiz kılar.
+# Paylaşılan cache yoksa (memory://) claim'li token'lar da DB yolundan doğrulanır.
+# Sadece en az bir kez değişmiş (sürüm > 1) profiller yazılır: sürüm 1 token'ları
+# ancak sürüm arttıysa eskimiş olabilir.
+
+
+def current_profile_version(user: User) -> int:
+    """Eski kayıtlarda kolon boş olabilir → 1 kabul edilir."""
+    return user.profile_version or 1
+
+
+def version_key(user_id: str) -> str:
+    return f"pv:{user_id}"
+
+
+def profile_claims(user: User) -> Dict[str, Any]:
+    """
+    Token'a gömülen kompakt profil özeti: sadece profil sürümü. Günlük sonuç cache'i
+    ve eskime kontrolü için bu yeterli; havuz/element gibi alanlar hiç okunmuyordu.
+    """
+    return {"pv": current_profile_version(user)}
+
+
+def note_profile_versions(versions: Dict[str, int]) -> None:
+    cache = get_shared_cache()
+    if cache is None:
+        return
+    items = {version_key(uid): v for uid, v in versions.items() if v > 1}
+    cache.set_many(items, ttl=settings.JWT_EXPIRE_DAYS * 24 * 3600)
+
+
+def note_profile_version(user_id: str, version: int) -> None:
+    note_profile_versions({user_id: version})
+
+
+def lookup_daily(claims: TokenClaims, day: date) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Profil claim'li token için tek cache gidiş-dönüşünde (MGET):
+    - token eskimiş mi (bilinen sürüm token'dakinden büyük)
+    - bugünün sonucu (token'daki profil sürümüyle üretilmişse)
+    Paylaşılan cache yoksa (False, None): çağıran DB'den doğrular.
+    """
+    cache = get_shared_cache()
+    if cache is None:
+        return False, None
+    known, entry = cache.get_many([
+        version_key(claims.user_id),
+        daily_cache_key(claims.user_id, day, settings.DAILY_WORD_STRATEGY),
+    ])
+    if known is not None and claims.profile_version < known:
+        return True, None
+    if not entry or entry["pv"] != claims.profile_version:
+        return False, None
+    word1, word2, motto = entry["w"]
+    return False, {"word1": word1, "word2": word2, "motto": motto, "date": day.isoformat()}
@@ -0,0 +1,245 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..cache import get_cache
+from ..config import settings
+from ..models import User
+from .astrology import compute_sun_lon, compute_transits, daily_astro_word
+from .numerology import daily_energy_word as numerology_daily
+from .energy import (
+    get_zodiac_element_from_birth,
+    pick_personal_daily_energy_word,
+    build_motto as build_energy_motto,
+)
+from .pools import ensure_cornerstone_pool
+from .words_engine import load_json, pick_word1, build_motto
+
+# ----------------------------------------------------
+# GİRDİ SAĞLAYICILAR (lazy + memoize)
+# ----------------------------------------------------
+
+PROVIDERS: Dict[str, Callable[["DailyInputs"], Any]] = {}
+
+
+def provider(name: str):
+    """Bir günlük girdiyi hesaplayan fonksiyonu kayıt eder."""
+    def deco(fn):
+        PROVIDERS[name] = fn
+        return fn
+    return deco
+
+
+class DailyInputs:
+    """
+    Kullanıcı + gün için girdiler. Her girdi ilk istendiğinde hesaplanır ve saklanır;
+    istenmeyen girdi (örn. swisseph Güneş boylamı) hiç hesaplanmaz.
+    - preset: dışarıdan hazır verilen değerler (örn. yeni havuz, toplu hesaplanmış sonuçlar)
+    - computed: bu istekte gerçekten hesaplanan girdiler (ölçüm için)
+    """
+
+    def __init__(self, user: User, current_day: date, preset: Optional[Dict[str, Any]] = None):
+        self.user = user
+        self.day = current_day
+        self.dt = datetime.combine(current_day, datetime.min.time())
+        self._values: Dict[str, Any] = dict(preset or {})
+        self.computed: List[str] = []
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._values:
+            self._values[name] = self._provide(name)
+            self.computed.append(name)
+        return self._values[name]
+
+    def _provide(self, name: str) -> Any:
+        """Alt sınıflar (örn. toplu/cohort hesap) paylaşılan girdileri buradan verir."""
+        return PROVIDERS[name](self)
+
+
+@provider("pool")
+def _pool(inp: DailyInputs) -> List[str]:
+    return ensure_cornerstone_pool(inp.user)
+
+
+@provider("sun_lon")
+def _sun_lon(inp: DailyInputs) -> float:
+    """Natal Güneş boylamı: sadece doğum tarih/saatine bağlı (ev/Ay hesabı ve yer çözümü yok)."""
+    return compute_sun_lon(inp.user.birth_date)
+
+
+@lru_cache(maxsize=8)
+def cached_transits(dt: datetime) -> Dict[str, float]:
+    """Transitler sadece güne bağlı: process içinde ve paylaşılan cache'te günde bir kez."""
+    cache = get_cache()
+    key = f"transits:{dt.isoformat()}"
+    transits = cache.get(key)
+    if transits is None:
+        transits = compute_transits(dt)
+        cache.set(key, transits, ttl=settings.DAILY_CACHE_TTL)
+    return transits
+
+
+@provider("transits")
+def _transits(inp: DailyInputs) -> Dict[str, float]:
+    return cached_transits(inp.dt)
+
+
+@provider("astro_word")
+def _astro_word(inp: DailyInputs) -> str:
+    # daily_astro_word natal haritadan sadece Güneş boylamını kullanır
+    return daily_astro_word({"sun_lon": inp["sun_lon"]}, inp["transits"], inp.dt)
+
+
+@provider("numerology_word")
+def _numerology_word(inp: DailyInputs) -> str:
+    return numerology_daily(inp.dt, load_json("numerology_keywords.json"))
+
+
+@provider("anchor_word")
+def _anchor_word(inp: DailyInputs) -> str:
+    """
+    pick_word2 ile aynı seçim: çift günlerde astro, tek günlerde numeroloji.
+    Tek günlerde Güneş boylamı + transit hesaplanmaz.
+    """
+    if inp.dt.toordinal() % 2 == 0:
+        return inp["astro_word"]
+    return inp["numerology_word"]
+
+
+@provider("cornerstone_word")
+def _cornerstone_word(inp: DailyInputs) -> str:
+    return pick_word1(inp["anchor_word"], inp["pool"])
+
+
+@provider("element")
+def _element(inp: DailyInputs) -> str:
+    return get_zodiac_element_from_birth(inp.user.birth_date)
+
+
+@provider("energy_word")
+def _energy_word(inp: DailyInputs) -> str:
+    word, _ = pick_personal_daily_energy_word(inp.user, inp.day)
+    return word
+
+
+# ----------------------------------------------------
+# STRATEJİ KAYDI
+# ----------------------------------------------------
+
+
+@dataclass(frozen=True)
+class WordStrategy:
+    """
+    Günlük word1/word2/motto üretim stratejisi.
+    - requires: stratejinin kullandığı girdiler (sadece bunlar ve bağımlılıkları hesaplanır)
+    - catalogs: günlük sonucu etkileyen katalog dosyaları (katalog senkronizasyonu için)
+    - anchor: relationship_map anahtarı olarak kullanılan girdi; değeri DailyWord.anchor'a
+      yazılır, katalog senkronu ilişki değişikliklerinde sadece bu satırları yeniden hesaplar
+    """
+    name: str
+    requires: Tuple[str, ...]
+    catalogs: Tuple[str, ...]
+    anchor: str
+    compute: Callable[[DailyInputs], Tuple[str, str, str]]
+
+
+STRATEGIES: Dict[str, WordStrategy] = {}
+
+
+def register_strategy(
+    name: str,
+    requires: Tuple[str, ...],
+    catalogs: Tuple[str, ...],
+    anchor: str = "anchor_word",
+):
+    def deco(fn):
+        STRATEGIES[name] = WordStrategy(
+            name=name,
+            requires=requires,
+            catalogs=catalogs,
+            anchor=anchor,
+            compute=fn,
+        )
+        return fn
+    return deco
+
+
+def get_strategy(name: Optional[str] = None) -> WordStrategy:
+    name = name or settings.DAILY_WORD_STRATEGY
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown daily word strategy: {name}")
+
+
+def run_strategy(
+    strategy: WordStrategy,
+    user: User,
+    current_day: date,
+    preset: Optional[Dict[str, Any]] = None,
+    inputs: Optional[DailyInputs] = None,
+) -> Tuple[str, str, str]:
+    """Stratejinin bildirdiği girdileri çözer (bağımlılıkları lazy) ve sonucu üretir."""
+    inputs = inputs or DailyInputs(user, current_day, preset)
+    for name in strategy.requires:
+        inputs[name]
+    return strategy.compute(inputs)
+
+
+def run_strategy_row(
+    strategy: WordStrategy,
+    user: User,
+    current_day: date,
+    preset: Optional[Dict[str, Any]] = None,
+    inputs: Optional[DailyInputs] = None,
+) -> Tuple[str, str, str, str]:
+    """run_strategy + DailyWord.anchor değeri: (word1, word2, motto, anchor)."""
+    inputs = inputs or DailyInputs(user, current_day, preset)
+    word1, word2, motto = run_strategy(strategy, user, current_day, inputs=inputs)
+    return word1, word2, motto, inputs[strategy.anchor]
+
+
+@register_strategy(
+    "personal_energy",
+    requires=("cornerstone_word", "energy_word", "element"),
+    catalogs=("relationship_map.json", "numerology_keywords.json"),
+)
+def _personal_energy(inp: DailyInputs) -> Tuple[str, str, str]:
+    """
+    API'nin sunduğu varsayılan çıktı:
+    - word1: köşe taşı (pick_word1, anchor = astro/numeroloji kelimesi)
+    - word2: kişisel günlük enerji kelimesi
+    - motto: element tabanlı motto
+    """
+    word1 = inp["cornerstone_word"]
+    energy = inp["energy_word"]
+    return word1, energy, build_energy_motto(word1, energy, inp["element"])
+
+
+@register_strategy(
+    "classic",
+    requires=("cornerstone_word", "anchor_word"),
+    catalogs=("relationship_map.json", "motto_templates.json", "numerology_keywords.json"),
+)
+def _classic(inp: DailyInputs) -> Tuple[str, str, str]:
+    """Eski words_engine çıktısı: word2 = astro/numeroloji kelimesi, motto_templates.json."""
+    word1 = inp["cornerstone_word"]
+    word2 = inp["anchor_word"]
+    return word1, word2, build_motto(word1, word2)
+
+
+@register_strategy(
+    "lean",
+    requires=("pool", "energy_word", "element"),
+    catalogs=("relationship_map.json",),
+    anchor="energy_word",
+)
+def _lean(inp: DailyInputs) -> Tuple[str, str, str]:
+    """
+    swisseph gerektirmeyen strateji: köşe taşı, enerji kelimesinin
+    relationship_map ilişkilerinden seçilir.
+    """
+    energy = inp["energy_word"]
+    word1 = pick_word1(energy, inp["pool"])
+    return word1, energy, build_energy_motto(word1, energy, inp["element"])
@@ -1,17 +1,26 @@
+import hashlib
 import json
-from datetime import date, datetime
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
-from sqlmodel import Session, select
-
-from ..models import User, DailyWord
-from .astrology import compute_natal, compute_transits, daily_astro_word
+from .astrology import compute_natal, compute_sun_sign, compute_transits, daily_astro_word
 from .numerology import core_numbers, daily_energy_word as numerology_daily
 from .chinese import zodiac_for_year, element_for_year
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
+# Havuz ve günlük kelime üretimini belirleyen katalog dosyaları
+POOL_CATALOGS = ("astro_keywords.json", "chinese_keywords.json", "numerology_keywords.json")
+DAILY_CATALOGS = ("relationship_map.json", "motto_templates.json")
+
+
+def catalog_version(names: Tuple[str, ...] = POOL_CATALOGS) -> Tuple:
+    """Diskteki katalog dosyalarının sürüm parmak izi (değişiklik zamanı + boyut)."""
+    return tuple(
+        (st.st_mtime_ns, st.st_size) for st in (DATA_DIR.joinpath(n).stat() for n in names)
+    )
+
 
 def load_json(name: str) -> dict:
     """app/data içinden JSON dosyası yükler."""
@@ -19,62 +28,99 @@ def load_json(name: str) -> dict:
         return json.load(f)
 
 
-def ensure_cornerstone_pool(u: User) -> List[str]:
-    """User.cornerstone_pool JSON string'ini Python list'e çevirir."""
-    return json.loads(u.cornerstone_pool)
+def stable_hash(text: str) -> int:
+    """
+    Process'ten bağımsız hash: hash() her process'te farklı tohumlanır (PYTHONHASHSEED),
+    seçimler worker'lar arasında ve yeniden hesapta (katalog senkronu) aynı kalmalı.
+    """
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest(), 16)
 
 
-def build_cornerstone_pool(
-    first_name: str,
-    last_name: str,
-    birth_date: datetime,
-    birth_place: str,
+# (sun_sign, chinese_animal, chinese_element, destiny, soul, personality, life_path)
+PoolFeatures = Tuple[str, str, str, int, int, int, int]
+
+
+def pool_features(first_name: str, last_name: str, birth_date: datetime) -> PoolFeatures:
+    """
+    Havuzu belirleyen küçük özellik grubu.
+    Güneş burcu doğum yerinden bağımsızdır; natal ev hesabı gerekmez.
+    """
+    nums = core_numbers(first_name, last_name, birth_date)
+    return (
+        compute_sun_sign(birth_date),
+        zodiac_for_year(birth_date.year),
+        element_for_year(birth_date.year),
+        nums["destiny"],
+        nums["soul"],
+        nums["personality"],
+        nums["life_path"],
+    )
+
+
+def build_pool_from_features(
+    features: PoolFeatures,
+    catalogs: Optional[Dict[str, dict]] = None,
 ) -> List[str]:
     """
-    Kayıt anında 1 kez çalışan fonksiyon.
-    - Batı astrolojisi (Güneş, Ay, ASC) → astro_keywords.json
+    Özelliklerden havuz kelimeleri (tekrarlar temizlenmiş, 50 sınırı uygulanmamış).
+    - Batı astrolojisi (Güneş burcu) → astro_keywords.json
     - Çin astrolojisi (hayvan + element) → chinese_keywords.json
     - Numeroloji (destiny, soul, personality, life_path) → numerology_keywords.json
-    Sonuç: 30–50 kelimelik kişisel havuz (tekrarlar temizlenmiş, max 50).
+    catalogs verilirse ({dosya_adı: içerik}, örn. katalog senkronu) diskten okunmaz.
     """
-    astro_kw = load_json("astro_keywords.json")
-    num_kw = load_json("numerology_keywords.json")
-    chi_kw = load_json("chinese_keywords.json")
+    if catalogs is None:
+        catalogs = {name: load_json(name) for name in POOL_CATALOGS}
+    astro_kw = catalogs["astro_keywords.json"]
+    num_kw = catalogs["numerology_keywords.json"]
+    chi_kw = catalogs["chinese_keywords.json"]
 
-    natal = compute_natal(first_name, last_name, birth_date, birth_place)
-    nums = core_numbers(first_name, last_name, birth_date)
+    sun_sign, zy, el = features[:3]
 
     pool: List[str] = []
 
     # Batı astro: Güneş burcu
-    sun_sign = natal["sun_sign"]
     pool.extend(astro_kw.get(sun_sign, [])[:5])
 
     # Çin zodyak: hayvan + element
-    zy = zodiac_for_year(birth_date.year)
-    el = element_for_year(birth_date.year)
     pool.extend(chi_kw.get(zy, [])[:5])
     pool.extend(chi_kw.get(el, [])[:5])
 
     # Numeroloji: 4 temel sayı
-    for k, v in nums.items():
+    for v in features[3:]:
         pool.extend(num_kw.get(str(v), [])[:5])
 
-    # Tekrarları temizle + maksimum 50 kelime
+    # Tekrarları temizle
     dedup: List[str] = []
     seen = set()
     for w in pool:
         if w not in seen:
             seen.add(w)
             dedup.append(w)
+    return dedup
 
-    if len(dedup) > 50:
-        # Deterministik bir seçim için isim/soyisim tabanlı sıralama
-        key = (first_name + last_name + birth_place)
-        dedup.sort(key=lambda x: (hash(key + x) % 10_000))
-        dedup = dedup[:50]
 
-    return dedup
+def limit_personal_pool(words: List[str], first_name: str, last_name: str, birth_place: str) -> List[str]:
+    """50 kelimeyi aşan havuzlar için isim/yer tabanlı seçim (havuz kişiye özel olur)."""
+    if len(words) <= 50:
+        return words
+    key = (first_name + last_name + birth_place)
+    words = sorted(words, key=lambda x: (stable_hash(key + x) % 10_000))
+    return words[:50]
+
+
+def build_cornerstone_pool(
+    first_name: str,
+    last_name: str,
+    birth_date: datetime,
+    birth_place: str,
+) -> List[str]:
+    """
+    Kayıt anında 1 kez çalışan fonksiyon.
+    Sonuç: 30–50 kelimelik kişisel havuz (tekrarlar temizlenmiş, max 50).
+    Paylaşılan Pool kayıtları için bkz. pools.resolve_pool.
+    """
+    words = build_pool_from_features(pool_features(first_name, last_name, birth_date))
+    return limit_personal_pool(words, first_name, last_name, birth_place)
 
 
 def pick_word2(current_date: datetime, first_name: str, last_name: str, birth_date: datetime, birth_place: str) -> str:
@@ -113,7 +159,7 @@ def pick_word1(word2: str, cornerstone_pool: List[str]) -> str:
     if not cornerstone_pool:
         return "Odak"
 
-    idx = (hash(word2) % len(cornerstone_pool))
+    idx = (stable_hash(word2) % len(cornerstone_pool))
     return cornerstone_pool[idx]
 
 
@@ -126,55 +172,5 @@ def build_motto(word1: str, word2: str) -> str:
     templates = load_json("motto_templates.json")
     if not templates:
         return f"Bugün {word1}'ınız, {word2} yolunda size rehberlik edecek."
-    idx = (hash(word1 + word2) % len(templates))
+    idx = (stable_hash(word1 + word2) % len(templates))
     return templates[idx].replace("[word1]", word1).replace("[word2]", word2)
-
-
-def get_or_create_daily_words(session: Session, user: User, current_day: date) -> Tuple[str, str, str]:
-    """
-    - Aynı kullanıcı + aynı gün için kayıt varsa **cache** olarak onu döner.
-    - Yoksa yeni word1, word2, motto üretir; DB'ye yazar.
-    """
-    # Cache kontrolü
-    q = session.exec(
-        select(DailyWord).where(
-            DailyWord.user_id == user.user_id,
-            DailyWord.date == current_day,
-        )
-    ).first()
-    if q:
-        return q.word1, q.word2, q.motto
-
-    # Köşe taşı havuzu
-    cs_pool = ensure_cornerstone_pool(user)
-
-    # Günlük enerji kelimesi (word2)
-    current_dt = datetime.combine(current_day, datetime.min.time())
-    word2 = pick_word2(
-        current_dt,
-        user.first_name,
-        user.last_name,
-        user.birth_date,
-        user.birth_place,
-    )
-
-    # Köşe taşı kelimesi (word1)
-    word1 = pick_word1(word2, cs_pool)
-
-    # Motto
-    motto = build_motto(word1, word2)
-
-    # DB'ye kaydet
-    rec = DailyWord(
-        user_id=user.user_id,
-        date=current_day,
-        word1=word1,
-        word2=word2,
-        motto=motto,
-    )
-    session.add(rec)
-    session.commit()
-    session.refresh(rec)
-
-    return rec.word1, rec.word2, rec.motto
-
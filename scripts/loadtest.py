@@ -0,0 +1,419 @@
+"""
+SkullMod Daily Words API – uçtan uca yük testi.
+
+Yerel bir SQLite DB ile uvicorn'u ayağa kaldırır, N sentetik kullanıcı kaydeder,
+ardından /api/v1/daily-words ve /api/v1/register trafiğini verilen karışımla
+tekrar oynatır. Son olarak bir "gece yarısı geçişi" patlaması simüle edilir:
+sunucunun tarihi bir gün ileri alınır (scripts/loadtest_app.py) ve bütün
+kullanıcılar aynı anda istek atar. Yeni günün transitleri, cache kayıtları ve
+DailyWord satırları gerçekten yoktur; güne bağlı olmayan memo'lar (havuzlar,
+natal Güneş boylamı) gerçek gece yarısında olduğu gibi sıcak kalır.
+
+--cache memory (varsayılan, uygulamanın varsayılan CACHE_URL'i) ile günlük kelimeler
+cache'lenmez (her istek DB'ye gider), sadece transitler process içinde tutulur.
+--cache resp ile scripts/resp_standin.py ayağa kaldırılır ve worker'lar
+CACHE_URL=redis://... üzerinden aynı cache'i paylaşır. --cache both ikisini de
+çalıştırıp raporları yan yana verir.
+
+Sadece standart kütüphane kullanır. Örnek:
+
+    python scripts/loadtest.py --users 500 --duration 60 --concurrency 32 \\
+        --mix daily=0.95,register=0.05 --json report.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = {
+    "daily": ("GET", "/api/v1/daily-words"),
+    "register": ("POST", "/api/v1/register"),
+}
+
+FIRST_NAMES = [
+    "Ayşe", "Fatma", "Zeynep", "Elif", "Emine", "Merve", "Büşra", "Selin", "Deniz", "Ece",
+    "Mehmet", "Mustafa", "Ahmet", "Ali", "Hüseyin", "Emre", "Burak", "Can", "Kerem", "Yusuf",
+]
+LAST_NAMES = [
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk",
+    "Aydın", "Özdemir", "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara",
+]
+EXTRA_PLACES = [
+    "İstanbul, Türkiye", "Ankara, Türkiye", "İzmir, Türkiye", "Bursa, Türkiye",
+    "Antalya, Türkiye", "Konya, Türkiye", "Kayseri, Türkiye", "Berlin, Almanya",
+]
+
+
+# ----------------------------------------------------
+# SENTETİK KULLANICILAR
+# ----------------------------------------------------
+
+
+def load_places() -> List[str]:
+    """cities_min.json'daki yerler + bilinmeyen (UTC'ye düşen) gerçekçi girdiler."""
+    path = ROOT / "app" / "data" / "cities_min.json"
+    try:
+        known = list(json.loads(path.read_text(encoding="utf-8")))
+    except Exception:
+        known = []
+    return known + EXTRA_PLACES
+
+
+def synthetic_profile(rnd: random.Random, places: List[str]) -> Dict[str, str]:
+    """
+    Gerçekçi bir kayıt gövdesi:
+    - Yaş dağılımı 18–75, 25–40 arası yoğun (üçgen dağılım)
+    - Doğum saati gün içine yayılmış
+    """
+    age = rnd.triangular(18, 75, 30)
+    birth = datetime.now() - timedelta(days=age * 365.25)
+    birth = birth.replace(
+        hour=rnd.randint(0, 23), minute=rnd.randint(0, 59), second=0, microsecond=0
+    )
+    # Doğum yerlerinin çoğu bilinen şehirlerde
+    place = places[0] if places and rnd.random() < 0.5 else rnd.choice(places)
+    return {
+        "first_name": rnd.choice(FIRST_NAMES),
+        "last_name": rnd.choice(LAST_NAMES),
+        "birth_date": birth.isoformat(),
+        "birth_place": place,
+    }
+
+
+# ----------------------------------------------------
+# HTTP İSTEMCİ + ÖLÇÜM
+# ----------------------------------------------------
+
+
+class Recorder:
+    """Faz + uç nokta bazında gecikme ve hata kayıtları (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[Tuple[str, str], List[float]] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.wall: Dict[str, float] = {}
+
+    def add(self, phase: str, endpoint: str, seconds: float, ok: bool) -> None:
+        key = (phase, endpoint)
+        with self._lock:
+            self.samples.setdefault(key, []).append(seconds)
+            if not ok:
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+
+class Client:
+    """Thread başına kalıcı (keep-alive) bağlantı."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host, self.port, self.timeout = host, port, timeout
+        self._local = threading.local()
+
+    def _conn(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def request(self, method: str, path: str, body: Optional[dict] = None,
+                token: Optional[str] = None) -> Tuple[int, Optional[dict]]:
+        headers = {}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        conn = self._conn()
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self._local.conn = None
+            return 0, None
+        try:
+            payload = json.loads(raw) if raw else None
+        except ValueError:
+            payload = None
+        return resp.status, payload
+
+
+def call(client: Client, rec: Recorder, phase: str, endpoint: str,
+         body: Optional[dict] = None, token: Optional[str] = None) -> Optional[dict]:
+    method, path = ENDPOINTS[endpoint]
+    t0 = time.perf_counter()
+    status, payload = client.request(method, path, body, token)
+    elapsed = time.perf_counter() - t0
+    ok = status == 200 and bool(payload) and payload.get("success", True) is not False
+    rec.add(phase, endpoint, elapsed, ok)
+    return payload if ok else None
+
+
+# ----------------------------------------------------
+# FAZLAR
+# ----------------------------------------------------
+
+
+def phase_register(client, rec, profiles, concurrency) -> List[str]:
+    def one(p):
+        payload = call(client, rec, "setup", "register", body=p)
+        return payload["token"] if payload else None
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as ex:
+        tokens = [t for t in ex.map(one, profiles) if t]
+    rec.wall["setup"] = time.perf_counter() - t0
+    return tokens
+
+
+def phase_replay(client, rec, tokens, mix, duration, concurrency, rnd_seed, places) -> None:
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    deadline = time.perf_counter() + duration
+    lock = threading.Lock()
+
+    def worker(i: int):
+        rnd = random.Random(rnd_seed + i)
+        while time.perf_counter() < deadline:
+            endpoint = rnd.choices(names, weights)[0]
+            if endpoint == "register":
+                payload = call(client, rec, "replay", "register", body=synthetic_profile(rnd, places))
+                if payload:
+                    with lock:
+                        tokens.append(payload["token"])
+            else:
+                call(client, rec, "replay", "daily", token=rnd.choice(tokens))
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as ex:
+        list(ex.map(worker, range(concurrency)))
+    rec.wall["replay"] = time.perf_counter() - t0
+
+
+def phase_rollover(client, rec, tokens, day_file: Path, concurrency) -> None:
+    """
+    Gece yarısı geçişi: sunucunun tarihi bir gün ileri alınır (yeni gün = hiç kayıt,
+    cache ve transit yok), ardından tüm kullanıcılar aynı anda günlük kelimelerini ister.
+    """
+    day_file.write_text(str(int(day_file.read_text()) + 1))
+    start = threading.Event()
+
+    def one(token):
+        # Tüm worker'lar aynı anda salınır
+        start.wait()
+        call(client, rec, "rollover", "daily", token=token)
+
+    with ThreadPoolExecutor(concurrency) as ex:
+        futures = [ex.submit(one, t) for t in tokens]
+        t0 = time.perf_counter()
+        start.set()
+        for f in futures:
+            f.result()
+    rec.wall["rollover"] = time.perf_counter() - t0
+
+
+# ----------------------------------------------------
+# RAPOR
+# ----------------------------------------------------
+
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    """Nearest-rank yüzdelik."""
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, math.ceil(q / 100.0 * len(sorted_vals)) - 1))
+    return sorted_vals[k]
+
+
+def build_report(rec: Recorder, cache: str) -> List[Dict[str, float]]:
+    rows = []
+    for (phase, endpoint), vals in sorted(rec.samples.items()):
+        vals = sorted(vals)
+        n = len(vals)
+        errors = rec.errors.get((phase, endpoint), 0)
+        wall = rec.wall.get(phase) or 1e-9
+        rows.append({
+            "cache": cache,
+            "phase": phase,
+            "endpoint": endpoint,
+            "requests": n,
+            "throughput_rps": round(n / wall, 1),
+            "p50_ms": round(percentile(vals, 50) * 1000, 1),
+            "p95_ms": round(percentile(vals, 95) * 1000, 1),
+            "p99_ms": round(percentile(vals, 99) * 1000, 1),
+            "error_rate": round(errors / n, 4) if n else 0.0,
+        })
+    return rows
+
+
+def print_report(rows: List[Dict[str, float]]) -> None:
+    cols = ["cache", "phase", "endpoint", "requests", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "error_rate"]
+    widths = [max(len(c), *(len(str(r[c])) for r in rows)) for c in cols] if rows else [len(c) for c in cols]
+    print("  ".join(c.ljust(w) for c, w in zip(cols, widths)))
+    for r in rows:
+        print("  ".join(str(r[c]).ljust(w) for c, w in zip(cols, widths)))
+
+
+# ----------------------------------------------------
+# SUNUCU
+# ----------------------------------------------------
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_cache(port: int) -> subprocess.Popen:
+    cmd = [sys.executable, str(ROOT / "scripts" / "resp_standin.py"), "--port", str(port)]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("cache sunucusu başlatılamadı")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("cache sunucusu 10 sn içinde hazır olmadı")
+
+
+def start_server(port: int, db_path: str, workers: int, cache_url: str, day_file: Path) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        CACHE_URL=cache_url,
+        LOADTEST_DAY_FILE=str(day_file),
+    )
+    cmd = [
+        sys.executable, "-m", "uvicorn", "scripts.loadtest_app:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("uvicorn başlatılamadı")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn 30 sn içinde hazır olmadı")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"bilinmeyen uç nokta: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def run_scenario(args, cache: str, profiles, places) -> Optional[List[Dict[str, float]]]:
+    """Temiz bir DB + sunucu ile kayıt, tekrar oynatma ve gece yarısı fazları."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "loadtest.db")
+        day_file = Path(tmp) / "day_offset"
+        day_file.write_text("0")
+        port = free_port()
+        cache_proc = None
+        cache_url = "memory://"
+        if cache == "resp":
+            cache_port = free_port()
+            cache_proc = start_cache(cache_port)
+            cache_url = f"redis://127.0.0.1:{cache_port}/0"
+        try:
+            proc = start_server(port, db_path, args.workers, cache_url, day_file)
+        except Exception:
+            if cache_proc is not None:
+                cache_proc.terminate()
+            raise
+        try:
+            client = Client("127.0.0.1", port, args.timeout)
+            rec = Recorder()
+            tokens = phase_register(client, rec, profiles, args.concurrency)
+            if not tokens:
+                print("Hiç kullanıcı kaydedilemedi.", file=sys.stderr)
+                return None
+            phase_replay(client, rec, tokens, args.mix, args.duration, args.concurrency, args.seed, places)
+            if not args.no_rollover:
+                phase_rollover(client, rec, tokens, day_file, args.concurrency)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+            if cache_proc is not None:
+                cache_proc.terminate()
+                cache_proc.wait(timeout=10)
+    return build_report(rec, cache)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=200, help="kaydedilecek sentetik kullanıcı sayısı")
+    ap.add_argument("--duration", type=float, default=30, help="tekrar oynatma süresi (sn)")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--mix", type=parse_mix, default=parse_mix("daily=0.95,register=0.05"))
+    ap.add_argument("--workers", type=int, default=1, help="uvicorn worker sayısı")
+    ap.add_argument("--cache", choices=("memory", "resp", "both"), default="memory",
+                    help="memory: uygulamanın varsayılanı (process içi); resp: worker'lar arası "
+                         "paylaşılan yerel RESP sunucusu; both: ikisi de")
+    ap.add_argument("--no-rollover", action="store_true", help="gece yarısı patlamasını atla")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--timeout", type=float, default=30)
+    ap.add_argument("--json", help="raporu bu dosyaya JSON olarak yaz")
+    args = ap.parse_args(argv)
+
+    rnd = random.Random(args.seed)
+    places = load_places()
+    profiles = [synthetic_profile(rnd, places) for _ in range(args.users)]
+
+    rows: List[Dict[str, float]] = []
+    for cache in (("memory", "resp") if args.cache == "both" else (args.cache,)):
+        scenario = run_scenario(args, cache, profiles, places)
+        if scenario is None:
+            return 1
+        rows.extend(scenario)
+
+    print_report(rows)
+    if not args.no_rollover:
+        print(
+            "\nNot: rollover fazında sunucu tarihi +1 gün kaydırılır; transit, günlük cache ve "
+            "DailyWord ıskaları gerçektir. Güne bağlı olmayan process memo'ları (havuzlar, "
+            "natal Güneş boylamı) gerçek gece yarısında olduğu gibi sıcak kalır; soğuk başlangıç "
+            "(yeni deploy / worker yeniden başlatma) bu ölçüme dahil değildir."
+        )
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""
+Yük testi için uygulama sarmalayıcısı (scripts/loadtest.py tarafından başlatılır).
+
+daily_words'ün gördüğü "bugün"ü LOADTEST_DAY_FILE dosyasındaki gün sayısı kadar
+ileri alır; böylece gece yarısı fazı tüm worker'larda gerçek bir gün değişimi olur
+(yeni günün transitleri, cache anahtarları ve DailyWord satırları yoktur).
+"""
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+from app import main
+
+_DAY_FILE = Path(os.environ["LOADTEST_DAY_FILE"])
+
+
+class _ShiftedDate(date):
+    @classmethod
+    def today(cls) -> date:
+        return date.today() + timedelta(days=int(_DAY_FILE.read_text() or 0))
+
+
+main.date = _ShiftedDate
+app = main.app
@@ -0,0 +1,180 @@
+"""
+Redis yerine geçen minimal, yerel RESP2 sunucusu (sadece standart kütüphane).
+
+CACHE_URL=redis://... arka ucunu gerçek bir Redis kurmadan denemek ve yük testi
+(scripts/loadtest.py) sırasında worker'lar arası paylaşılan cache'i simüle etmek
+içindir. Kalıcılık, replikasyon vb. yoktur. Örnek:
+
+    python scripts/resp_standin.py --port 6390
+    CACHE_URL=redis://127.0.0.1:6390/0 uvicorn app.main:app --workers 4
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+# db → {anahtar: (bitiş zamanı veya None, değer)}
+Store = Dict[bytes, Tuple[Optional[float], bytes]]
+
+
+class RespError(Exception):
+    pass
+
+
+def _bulk(v: Optional[bytes]) -> bytes:
+    if v is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(v), v)
+
+
+def _array(items: List[Optional[bytes]]) -> bytes:
+    return b"*%d\r\n" % len(items) + b"".join(_bulk(i) for i in items)
+
+
+def _int(n: int) -> bytes:
+    return b":%d\r\n" % n
+
+
+OK = b"+OK\r\n"
+
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # inline komut (örn. telnet ile "PING")
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        header = await reader.readline()
+        if not header.startswith(b"$"):
+            raise RespError("ERR Protocol error: expected '$'")
+        n = int(header[1:-2])
+        data = await reader.readexactly(n + 2)
+        args.append(data[:-2])
+    return args
+
+
+class Server:
+    def __init__(self, password: Optional[str] = None):
+        self.dbs: Dict[int, Store] = {}
+        self.password = password.encode() if password else None
+
+    def _get(self, store: Store, key: bytes) -> Optional[bytes]:
+        entry = store.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= time.monotonic():
+            del store[key]
+            return None
+        return entry[1]
+
+    def execute(self, state: dict, args: List[bytes]) -> bytes:
+        cmd = args[0].upper().decode()
+        if self.password and not state["auth"] and cmd not in ("AUTH", "PING", "QUIT"):
+            raise RespError("NOAUTH Authentication required.")
+        store = self.dbs.setdefault(state["db"], {})
+
+        if cmd == "PING":
+            return _bulk(args[1]) if len(args) > 1 else b"+PONG\r\n"
+        if cmd == "ECHO":
+            return _bulk(args[1])
+        if cmd == "AUTH":
+            if self.password is None or args[-1] != self.password:
+                raise RespError("WRONGPASS invalid password")
+            state["auth"] = True
+            return OK
+        if cmd == "SELECT":
+            state["db"] = int(args[1])
+            return OK
+        if cmd == "GET":
+            return _bulk(self._get(store, args[1]))
+        if cmd == "MGET":
+            return _array([self._get(store, k) for k in args[1:]])
+        if cmd == "SET":
+            expires = None
+            opts = [a.upper() for a in args[3:]]
+            if b"NX" in opts and self._get(store, args[1]) is not None:
+                return _bulk(None)
+            for i, opt in enumerate(opts):
+                if opt == b"EX":
+                    expires = time.monotonic() + int(args[3 + i + 1])
+                elif opt == b"PX":
+                    expires = time.monotonic() + int(args[3 + i + 1]) / 1000.0
+            store[args[1]] = (expires, args[2])
+            return OK
+        if cmd == "MSET":
+            for k, v in zip(args[1::2], args[2::2]):
+                store[k] = (None, v)
+            return OK
+        if cmd == "DEL":
+            return _int(sum(1 for k in args[1:] if store.pop(k, None) is not None))
+        if cmd == "EXISTS":
+            return _int(sum(1 for k in args[1:] if self._get(store, k) is not None))
+        if cmd == "EXPIRE":
+            value = self._get(store, args[1])
+            if value is None:
+                return _int(0)
+            store[args[1]] = (time.monotonic() + int(args[2]), value)
+            return _int(1)
+        if cmd == "DBSIZE":
+            return _int(len(store))
+        if cmd == "FLUSHDB":
+            store.clear()
+            return OK
+        if cmd == "FLUSHALL":
+            self.dbs.clear()
+            return OK
+        raise RespError(f"ERR unknown command '{cmd}'")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        state = {"db": 0, "auth": False}
+        try:
+            while True:
+                try:
+                    args = await read_command(reader)
+                except RespError as exc:
+                    writer.write(b"-%s\r\n" % str(exc).encode())
+                    break
+                if args is None:
+                    break
+                if not args:
+                    continue
+                if args[0].upper() == b"QUIT":
+                    writer.write(OK)
+                    break
+                try:
+                    writer.write(self.execute(state, args))
+                except (RespError, ValueError, IndexError) as exc:
+                    msg = str(exc) if isinstance(exc, RespError) else "ERR syntax error"
+                    writer.write(b"-%s\r\n" % msg.encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str, port: int, password: Optional[str]) -> None:
+    server = await asyncio.start_server(Server(password).handle, host, port)
+    addr = ", ".join(str(s.getsockname()) for s in server.sockets)
+    print(f"RESP stand-in listening on {addr}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=6379)
+    ap.add_argument("--password")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.password))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Test process'i için (uygulama modülleri import edilmeden önce)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+# Alt process'lerde katalogları geçici kopyadan okut
+PRELUDE = """
+import json, os, sys
+from pathlib import Path
+from typing import Optional
+from app.services import geo, words_engine
+words_engine.DATA_DIR = geo.DATA_DIR = Path(os.environ["TEST_DATA_DIR"])
+"""
+
+
+class AppProcess:
+    """
+    Uygulama kodunu ayrı bir Python process'inde çalıştırır (ayrı worker gibi):
+    aynı SQLite DB ve katalog kopyası paylaşılır, process içi memo/cache paylaşılmaz.
+    Kod son satırda JSON yazdırır; çözülmüş değer döner.
+    """
+
+    def __init__(self, tmp_path: Path):
+        self.db_path = tmp_path / "app.db"
+        self.data_dir = tmp_path / "data"
+        shutil.copytree(ROOT / "app" / "data", self.data_dir)
+
+    def catalog(self, name: str):
+        return json.loads((self.data_dir / name).read_text(encoding="utf-8"))
+
+    def write_catalog(self, name: str, value) -> None:
+        (self.data_dir / name).write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+
+    def argv(self, code: str):
+        """Aynı ortamla çalıştırılabilecek komut (kodun içinden ayrı process başlatmak için)."""
+        return [sys.executable, "-c", PRELUDE + textwrap.dedent(code)]
+
+    def run(self, code: str, hash_seed: int = 0, **env):
+        full_env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{self.db_path}",
+            TEST_DATA_DIR=str(self.data_dir),
+            PYTHONHASHSEED=str(hash_seed),
+            **{k: str(v) for k, v in env.items()},
+        )
+        proc = subprocess.run(
+            self.argv(code),
+            cwd=ROOT,
+            env=full_env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert proc.returncode == 0, proc.stderr
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_standin(*args: str, port: Optional[int] = None):
+    """scripts/resp_standin.py'yi (verilmezse boş bir) portta başlatır: (process, port)."""
+    port = port or free_port()
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "scripts" / "resp_standin.py"), "--port", str(port), *args],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 10
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return proc, port
+        except OSError:
+            if time.time() > deadline or proc.poll() is not None:
+                proc.kill()
+                raise RuntimeError("RESP stand-in did not start")
+            time.sleep(0.05)
+
+
+@pytest.fixture
+def app_process(tmp_path):
+    return AppProcess(tmp_path)
@@ -0,0 +1,145 @@
+import json
+import logging
+import time
+
+import pytest
+
+from app.cache import MemoryCache, RedisCache, create_cache
+
+from conftest import free_port, start_standin
+
+
+@pytest.fixture(scope="module")
+def standin():
+    proc, port = start_standin("--password", "s3cret")
+    yield port
+    proc.terminate()
+    proc.wait(timeout=10)
+
+
+def _redis(port: int, password: str = "s3cret", db: int = 0, **kw) -> RedisCache:
+    return RedisCache(f"redis://:{password}@127.0.0.1:{port}/{db}", prefix="t:", **kw)
+
+
+def test_mget_and_pipelined_set(standin):
+    cache = _redis(standin)
+    items = {f"k{i}": {"w": ["Odak", "Akış", f"motto {i}"], "pv": i} for i in range(200)}
+    cache.set_many(items)
+    keys = list(items) + ["missing"]
+    assert cache.get_many(keys) == list(items.values()) + [None]
+
+    cache.delete(["k0", "k1"])
+    assert cache.get_many(["k0", "k1", "k2"]) == [None, None, items["k2"]]
+    cache.close()
+
+
+def test_set_with_ttl_expires(standin):
+    cache = _redis(standin)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=60)
+    assert cache.get_many(["short", "long"]) == [1, 2]
+    time.sleep(1.2)
+    assert cache.get_many(["short", "long"]) == [None, 2]
+
+
+def test_select_isolates_databases(standin):
+    db0, db1 = _redis(standin, db=0), _redis(standin, db=1)
+    db0.set("same", "zero")
+    db1.set("same", "one")
+    assert (db0.get("same"), db1.get("same")) == ("zero", "one")
+
+
+def test_connections_are_pooled(standin):
+    cache = _redis(standin, pool_size=2)
+    for i in range(50):
+        cache.set(f"p{i}", i)
+        assert cache.get(f"p{i}") == i
+    assert cache._created == 1
+
+
+def test_wrong_password_falls_back_to_miss(standin, caplog):
+    cache = _redis(standin, password="wrong")
+    with caplog.at_level(logging.WARNING, logger="app.cache"):
+        cache.set("x", 1)
+        assert cache.get_many(["x", "y"]) == [None, None]
+    assert "WRONGPASS" in caplog.text
+    assert cache._created == 0
+
+
+def test_server_down_falls_back_to_miss(caplog):
+    cache = RedisCache(f"redis://127.0.0.1:{free_port()}/0", timeout=0.2)
+    with caplog.at_level(logging.WARNING, logger="app.cache"):
+        cache.set("x", 1, ttl=10)
+        cache.delete(["x"])
+        assert cache.get("x") is None
+    assert "cache MGET failed" in caplog.text
+
+
+def test_writes_survive_server_restart(caplog):
+    proc, port = start_standin()
+    cache = RedisCache(f"redis://127.0.0.1:{port}/0", prefix="t:")
+    cache.set("pv:u1", 1)  # havuzda bir bağlantı kalır
+    proc.terminate()
+    proc.wait(timeout=10)
+
+    proc, port = start_standin(port=port)
+    try:
+        other = RedisCache(f"redis://127.0.0.1:{port}/0", prefix="t:")
+        other.set("daily:u1", "eski")
+        # Havuzdaki bağlantı ölü: DEL/SET yeni bağlantıyla tekrarlanmalı
+        with caplog.at_level(logging.WARNING, logger="app.cache"):
+            cache.delete(["daily:u1"])
+            cache.set("pv:u1", 2)
+        assert "failed" not in caplog.text
+        assert other.get_many(["pv:u1", "daily:u1"]) == [2, None]
+        assert cache._created == 1
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def test_memory_backend_is_not_shared():
+    assert isinstance(create_cache("memory://"), MemoryCache)
+    assert not create_cache("memory://").shared
+    assert create_cache("redis://127.0.0.1:6379/0").shared
+
+
+REWRITE = """
+from sqlalchemy import update
+from sqlmodel import Session
+from app.db import engine
+from app.models import DailyWord
+with Session(engine) as s:
+    s.execute(update(DailyWord).values(word1="Yeni"))
+    s.commit()
+print("{}")
+"""
+
+WORKER = """
+import subprocess
+from datetime import date, datetime
+from sqlmodel import Session
+from app.db import engine, init_db
+from app.models import User
+from app.services import pools
+from app.services.daily import get_or_create_daily_words
+
+init_db()
+with Session(engine) as s:
+    u = User(user_id="u1", first_name="Ada", last_name="Kaya",
+             birth_date=datetime(1990, 4, 2, 12), birth_place="Niğde, Türkiye")
+    pools.assign_pool(s, u)
+    s.add(u)
+    s.commit()
+    get_or_create_daily_words(s, u, date(2030, 1, 1))
+    # Başka bir worker satırı yeniden yazar (örn. katalog senkronu)
+    subprocess.run(json.loads(os.environ["REWRITE_ARGV"]), check=True, stdout=subprocess.DEVNULL)
+    print(json.dumps(get_or_create_daily_words(s, u, date(2030, 1, 1))[0]))
+"""
+
+
+def test_memory_backend_does_not_serve_rows_rewritten_elsewhere(app_process):
+    word1 = app_process.run(
+        WORKER, CACHE_URL="memory://", REWRITE_ARGV=json.dumps(app_process.argv(REWRITE))
+    )
+    assert word1 == "Yeni"
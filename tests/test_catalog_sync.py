@@ -0,0 +1,105 @@
+from app.services.catalog_sync import diff_catalogs
+
+SETUP = """
+from datetime import date, datetime
+from sqlmodel import Session
+from app.db import engine, init_db
+from app.models import User
+from app.services import pools
+from app.services.catalog_sync import ensure_snapshot
+from app.services.daily import get_or_create_daily_words
+
+NAMES = ["Ada", "Deniz", "Efe", "Elif", "Kaan", "Mert", "Nil", "Umut"]
+SURNAMES = ["Kaya", "Demir", "Yıldız", "Aydın", "Şahin"]
+
+init_db()
+rows = {}
+with Session(engine) as s:
+    ensure_snapshot(s)
+    for i in range(40):
+        u = User(
+            user_id=f"u{i:03d}",
+            first_name=NAMES[i % len(NAMES)],
+            last_name=SURNAMES[i % len(SURNAMES)],
+            birth_date=datetime(1960 + i, 1 + i % 12, 1 + (i * 7) % 28, i % 24),
+            birth_place="Niğde, Türkiye",
+        )
+        pools.assign_pool(s, u)
+        s.add(u)
+        s.commit()
+        for day in (date(2030, 1, 1), date(2030, 1, 2)):
+            rows[f"{u.user_id}:{day}"] = list(get_or_create_daily_words(s, u, day))
+print(json.dumps(rows))
+"""
+
+SYNC = """
+from datetime import date
+from sqlmodel import Session
+from app.db import engine
+from app.services.catalog_sync import sync_catalogs
+with Session(engine) as s:
+    print(json.dumps(sync_catalogs(s, dry_run=os.environ["DRY_RUN"] == "1", today=date(2030, 1, 1))))
+"""
+
+ROWS = """
+from sqlmodel import Session, select
+from app.db import engine
+from app.models import DailyWord
+with Session(engine) as s:
+    print(json.dumps({
+        f"{r.user_id}:{r.date}": [r.word1, r.word2, r.motto]
+        for r in s.exec(select(DailyWord))
+    }))
+"""
+
+
+def test_sync_in_other_process_keeps_unaffected_rows(app_process):
+    before = app_process.run(SETUP, hash_seed=1)
+
+    # Hiçbir havuzda olmayan bir kelime: ilişki listelerinin sonuna eklenince
+    # hiçbir satırın sonucu değişmemeli
+    rel = app_process.catalog("relationship_map.json")
+    for key in rel:
+        rel[key].append("Zzyzx")
+    app_process.write_catalog("relationship_map.json", rel)
+
+    report = app_process.run(SYNC, hash_seed=2, DRY_RUN=1)
+    assert report["changed_rows"] == 0
+
+    app_process.run(SYNC, hash_seed=3, DRY_RUN=0)
+    assert app_process.run(ROWS, hash_seed=4) == before
+
+
+def test_numerology_diff_uses_full_list_for_daily_words():
+    old = {"numerology_keywords.json": {"3": ["a", "b", "c", "d", "e", "f", "g"]}}
+    new = {"numerology_keywords.json": {"3": ["a", "b", "c", "d", "e", "f", "x"]}}
+    diff = diff_catalogs(old, new)
+    assert "numerology_keywords.json" not in diff.changed  # havuzlar etkilenmez
+    assert diff.numerology_changed == {"3"}
+
+    new = {"numerology_keywords.json": {"3": ["a", "b", "c", "d", "e", "f"]}}
+    assert diff_catalogs(old, new).numerology_changed == {"3"}
+
+
+ANCHORS = """
+from sqlmodel import Session, select
+from app.db import engine
+from app.models import DailyWord
+with Session(engine) as s:
+    print(json.dumps([r.anchor for r in s.exec(select(DailyWord))]))
+"""
+
+
+def test_relationship_change_only_touches_rows_with_that_anchor(app_process):
+    app_process.run(SETUP)
+    anchors = app_process.run(ANCHORS)
+    assert None not in anchors
+
+    anchor = max(set(anchors), key=anchors.count)
+    rel = app_process.catalog("relationship_map.json")
+    rel.setdefault(anchor, []).insert(0, "Zzyzx")
+    rel["Zzyzx-yeni"] = ["Odak"]
+    app_process.write_catalog("relationship_map.json", rel)
+
+    report = app_process.run(SYNC, DRY_RUN=1)
+    assert report["candidate_rows"] == anchors.count(anchor) < len(anchors)
@@ -0,0 +1,73 @@
+import gzip
+import json
+
+CLIENT = """
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlmodel import Session
+from app.config import settings
+from app.db import engine
+from app.main import app
+from app.models import DailyWord
+
+BIRTH = {"birth_date": "1990-04-02T12:00:00", "birth_place": "Niğde, Türkiye"}
+
+def raw(client, url, **headers):
+    with client.stream("GET", url, headers=headers) as r:
+        return r.status_code, r.headers.get("content-encoding"), b"".join(r.iter_raw()).hex()
+
+out = {}
+with TestClient(app) as client:
+    users = {}
+    for name in ("Ada", "Efe"):
+        r = client.post("/api/v1/register", json={"first_name": name, "last_name": "Kaya", **BIRTH}).json()
+        users[name] = (r["user_id"], {"Authorization": f"Bearer {r['token']}"})
+
+    # 64 KB'lık parçaları aşacak kadar geçmiş
+    with Session(engine) as s:
+        for name, n in (("Ada", 1500), ("Efe", 3)):
+            s.execute(insert(DailyWord), [
+                {"user_id": users[name][0], "date": date(2020, 1, 1) + timedelta(days=i),
+                 "word1": "Odak", "word2": "Akış", "motto": f"Şükür {i}"}
+                for i in range(n)
+            ])
+        s.commit()
+
+    ada_id, ada_auth = users["Ada"]
+    out["ids"] = {name: uid for name, (uid, _) in users.items()}
+    out["plain"] = client.get("/api/v1/daily-words/export", headers=ada_auth).text
+    out["gzip"] = raw(client, "/api/v1/daily-words/export?gzip=true", **ada_auth)
+    out["other"] = client.get("/api/v1/daily-words/export", headers=users["Efe"][1]).text
+
+    settings.ADMIN_TOKEN = ""
+    out["admin_disabled"] = client.get("/api/v1/admin/daily-words/export", headers={"X-Admin-Token": ""}).status_code
+    settings.ADMIN_TOKEN = "s3cret"
+    out["admin_wrong"] = client.get("/api/v1/admin/daily-words/export", headers={"X-Admin-Token": "nope"}).status_code
+    out["admin_missing"] = client.get("/api/v1/admin/daily-words/export").status_code
+    out["admin"] = client.get("/api/v1/admin/daily-words/export", headers={"X-Admin-Token": "s3cret"}).text
+print(json.dumps(out))
+"""
+
+
+def _lines(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_export_filtering_gzip_and_admin_guard(app_process):
+    out = app_process.run(CLIENT)
+    ada, efe = out["ids"]["Ada"], out["ids"]["Efe"]
+
+    plain = _lines(out["plain"])
+    assert len(plain) == 1500
+    assert {row["user_id"] for row in plain} == {ada}
+    assert {row["user_id"] for row in _lines(out["other"])} == {efe}
+
+    status, encoding, body = out["gzip"]
+    assert (status, encoding) == (200, "gzip")
+    assert gzip.decompress(bytes.fromhex(body)).decode("utf-8") == out["plain"]
+
+    assert out["admin_disabled"] == out["admin_wrong"] == out["admin_missing"] == 403
+    admin = _lines(out["admin"])
+    assert len(admin) == 1503
+    assert {row["user_id"] for row in admin} == {ada, efe}
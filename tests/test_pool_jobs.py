@@ -0,0 +1,86 @@
+SETUP = """
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from sqlmodel import Session
+from app.db import engine, init_db
+from app.models import Pool, User
+from app.services import pool_jobs, pools
+
+init_db()
+session = Session(engine)
+
+def add_user(user_id):
+    u = User(user_id=user_id, first_name="Ada", last_name="Kaya",
+             birth_date=datetime(1990, 4, 2, 12), birth_place="Niğde, Türkiye")
+    session.add(u)
+    session.commit()
+    return u
+
+def words_of(u):
+    return json.loads(session.get(Pool, u.pool_id).words)
+
+inline_key, inline_words = pools.resolve_pool("Ada", "Kaya", datetime(1990, 4, 2, 12), "Niğde, Türkiye")
+"""
+
+PENDING = SETUP + """
+# Bekleyen iş kısa süre sonra biter → ensure_pool onun sonucunu yazar
+u = add_user("u1")
+fut = Future()
+pool_jobs._pending["u1"] = fut
+threading.Timer(0.2, fut.set_result, (("job:u1", ["from", "job"]),)).start()
+pool_jobs.ensure_pool(session, u)
+
+# Hiç bitmeyen iş → zaman aşımı, satır içi hesap
+v = add_user("u2")
+pool_jobs._pending["u2"] = Future()
+pool_jobs.ensure_pool(session, v)
+print(json.dumps({"waited": words_of(u), "timed_out": words_of(v) == inline_words}))
+"""
+
+
+def test_ensure_pool_waits_for_pending_job_then_falls_back(app_process):
+    out = app_process.run(PENDING, POOL_WAIT_SECONDS="1")
+    assert out == {"waited": ["from", "job"], "timed_out": True}
+
+
+STORE = SETUP + """
+u = add_user("u1")
+pools.assign_pool(session, u)
+session.commit()
+before = u.pool_id
+# Arka plan işi geç kalıp yarışı kaybederse mevcut havuz ezilmez
+pool_jobs._store(session, "u1", "late:u1", ["late", "words"])
+session.refresh(u)
+print(json.dumps({"kept": u.pool_id == before, "words": words_of(u) == inline_words}))
+"""
+
+
+def test_store_does_not_overwrite_assigned_pool(app_process):
+    assert app_process.run(STORE) == {"kept": True, "words": True}
+
+
+QUEUE_FULL = """
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.db import engine
+from app.main import app
+from app.models import User
+from app.services import pool_jobs
+
+with TestClient(app) as client:
+    res = client.post("/api/v1/register", json={
+        "first_name": "Ada", "last_name": "Kaya",
+        "birth_date": "1990-04-02T12:00:00", "birth_place": "Niğde, Türkiye",
+    })
+    user_id = res.json()["user_id"]
+    with Session(engine) as s:
+        pool_id = s.get(User, user_id).pool_id
+    print(json.dumps({"status": res.status_code, "pending": len(pool_jobs._pending), "pool": pool_id is not None}))
+"""
+
+
+def test_register_falls_back_inline_when_queue_full(app_process):
+    out = app_process.run(QUEUE_FULL, REGISTER_ASYNC_POOL="true", POOL_QUEUE_LIMIT="0")
+    # Kuyruk dolu → submit False, havuz kayıt isteğinde bağlanır
+    assert out == {"status": 200, "pending": 0, "pool": True}
@@ -0,0 +1,136 @@
+import json
+
+SYNC = """
+from sqlmodel import Session
+from app.db import engine
+from app.services.catalog_sync import sync_catalogs
+with Session(engine) as s:
+    print(json.dumps(sync_catalogs(s, dry_run=False)))
+"""
+
+# Aynı process (worker) içinde: kayıt → başka process'te senkron → tekrar kayıt
+WORKER = """
+import subprocess
+from datetime import datetime
+from sqlmodel import Session
+from app.db import engine, init_db
+from app.models import Pool, User
+from app.services import pools
+from app.services.catalog_sync import ensure_snapshot
+from app.services.words_engine import load_json
+
+def register(user_id):
+    with Session(engine) as s:
+        u = User(user_id=user_id, first_name="Ada", last_name="Kaya",
+                 birth_date=datetime(1990, 4, 2, 12), birth_place="Niğde, Türkiye")
+        pools.assign_pool(s, u)
+        s.add(u)
+        s.commit()
+        pool = s.get(Pool, u.pool_id)
+        return pool.feature_key, json.loads(pool.words)
+
+init_db()
+with Session(engine) as s:
+    ensure_snapshot(s)
+register("u1")
+
+astro = load_json("astro_keywords.json")
+for words in astro.values():
+    words[0] = "Zzyzx"
+(words_engine.DATA_DIR / "astro_keywords.json").write_text(json.dumps(astro, ensure_ascii=False), encoding="utf-8")
+subprocess.run(json.loads(os.environ["SYNC_ARGV"]), check=True, stdout=subprocess.DEVNULL)
+
+key, words = register("u2")
+print(json.dumps({"key": key, "words": words}))
+"""
+
+
+def test_registration_after_sync_in_other_process_uses_active_pool(app_process):
+    result = app_process.run(WORKER, SYNC_ARGV=json.dumps(app_process.argv(SYNC)))
+    assert not result["key"].startswith("retired:")
+    assert "Zzyzx" in result["words"]
+
+
+ORPHAN = """
+from datetime import datetime
+from sqlmodel import Session
+from app.db import engine, init_db
+from app.models import Pool, User
+from app.services import pools
+from app.services.catalog_sync import ensure_snapshot, sync_catalogs
+
+init_db()
+with Session(engine) as s:
+    ensure_snapshot(s)
+    u = User(user_id="u1", first_name="Ada", last_name="Kaya",
+             birth_date=datetime(1990, 4, 2, 12), birth_place="Niğde, Türkiye")
+    pools.assign_pool(s, u)
+    s.add(u)
+    s.commit()
+    # Senkronla yarışan kayıt: kullanıcı emekliye ayrılan havuzda kalmış
+    pools.retire_pool(s, s.get(Pool, u.pool_id))
+    s.commit()
+    report = sync_catalogs(s, dry_run=False)
+    s.refresh(u)
+    print(json.dumps({
+        "report": report,
+        "key": s.get(Pool, u.pool_id).feature_key,
+        "version": u.profile_version,
+    }))
+"""
+
+
+def test_sync_moves_users_off_retired_pools(app_process):
+    result = app_process.run(ORPHAN)
+    assert result["report"]["orphaned_users"] == 1
+    assert not result["key"].startswith("retired:")
+    assert result["version"] == 2
+
+
+MIGRATE = """
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, select
+from app.db import engine, init_db
+from app.main import app
+from app.models import User
+from app.services import pools
+
+init_db()
+with Session(engine) as s:
+    for i in range(5):
+        key, words = pools.resolve_pool("Ada", f"Kaya{i}", datetime(1990, 4, 2, 12), "Niğde, Türkiye")
+        s.add(User(user_id=f"u{i}", first_name="Ada", last_name=f"Kaya{i}",
+                   birth_date=datetime(1990, 4, 2, 12), birth_place="Niğde, Türkiye",
+                   cornerstone_pool=json.dumps(words, ensure_ascii=False)))
+    s.commit()
+
+def legacy():
+    with Session(engine) as s:
+        return sum(1 for u in s.exec(select(User)) if u.pool_id is None)
+
+pools.BATCH_SIZE = 2
+statements = []
+event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+with TestClient(app) as client:
+    after_startup = legacy()
+    statements.clear()
+    res = client.post("/api/v1/admin/pools/migrate", headers={"X-Admin-Token": "s3cret"})
+    generation_checks = sum("max(catalogsnapshot.id)" in sql for sql in statements)
+    print(json.dumps({
+        "after_startup": after_startup,
+        "report": res.json(),
+        "left": legacy(),
+        "generation_checks": generation_checks,
+    }))
+"""
+
+
+def test_pool_migration_runs_on_demand_with_one_generation_check_per_batch(app_process):
+    out = app_process.run(MIGRATE, ADMIN_TOKEN="s3cret")
+    # Açılış göç yapmaz; admin uç noktası 3 partide (2+2+1) taşır
+    assert out["after_startup"] == 5
+    assert out["report"]["users"] == 5
+    assert out["left"] == 0
+    assert out["generation_checks"] == 3
@@ -0,0 +1,66 @@
+import pytest
+
+from conftest import start_standin
+
+CLIENT = """
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.db import engine
+from app.main import app
+from app.services.words_engine import load_json
+
+statements = []
+event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+def daily(client, token):
+    return client.get("/api/v1/daily-words", headers={"Authorization": f"Bearer {token}"})
+
+out = {}
+with TestClient(app) as client:
+    token = client.post("/api/v1/register", json={
+        "first_name": "Ada", "last_name": "Kaya",
+        "birth_date": "1990-04-02T12:00:00", "birth_place": "Niğde, Türkiye",
+    }).json()["token"]
+    first = daily(client, token)
+
+    statements.clear()
+    second = daily(client, token)
+    out["hit"] = [second.status_code, second.json() == first.json(), len(statements)]
+
+    # Havuzu değiştiren katalog düzenlemesi → senkron profil sürümünü artırır
+    astro = load_json("astro_keywords.json")
+    for words in astro.values():
+        words[0] = "Zzyzx"
+    (words_engine.DATA_DIR / "astro_keywords.json").write_text(json.dumps(astro, ensure_ascii=False), encoding="utf-8")
+    sync = client.post("/api/v1/admin/catalogs/sync?dry_run=false", headers={"X-Admin-Token": "s3cret"})
+    out["sync"] = [sync.status_code, sync.json()["changed_users"]]
+
+    out["stale"] = daily(client, token).status_code
+
+    refreshed = client.post("/api/v1/token/refresh", headers={"Authorization": f"Bearer {token}"})
+    new_token = refreshed.json()["token"]
+    out["refreshed"] = [refreshed.status_code, daily(client, new_token).status_code]
+print(json.dumps(out))
+"""
+
+
+@pytest.fixture(scope="module")
+def standin():
+    proc, port = start_standin()
+    yield port
+    proc.terminate()
+    proc.wait(timeout=10)
+
+
+def test_claims_token_cache_hit_stale_and_refresh(app_process, standin):
+    out = app_process.run(
+        CLIENT,
+        CACHE_URL=f"redis://127.0.0.1:{standin}/0",
+        JWT_PROFILE_CLAIMS="true",
+        ADMIN_TOKEN="s3cret",
+    )
+    # Paylaşılan cache isabetinde DB'ye hiç gidilmez
+    assert out["hit"] == [200, True, 0]
+    assert out["sync"] == [200, 1]
+    assert out["stale"] == 401
+    assert out["refreshed"] == [200, 200]